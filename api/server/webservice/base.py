@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import io
 import os
+import time
 import logging
 import mimetypes
+import threading
 
 from traceback import format_exc
+from collections import OrderedDict
 
 from typing import (
     Optional,
@@ -16,6 +19,7 @@ from typing import (
     Union,
     List,
     Dict,
+    Hashable,
     cast,
     TYPE_CHECKING,
 )
@@ -88,17 +92,43 @@ class WebServiceAPIServerBase(APIServerBase):
         NotImplementedError: 501,
     }
 
+    # Hop-by-hop headers, and headers that would be stale when replayed from the cache
+    UNCACHED_HEADERS = frozenset(
+        [
+            "connection",
+            "keep-alive",
+            "proxy-authenticate",
+            "proxy-authorization",
+            "te",
+            "trailer",
+            "transfer-encoding",
+            "upgrade",
+            "date",
+            "expires",
+        ]
+    )
+
     class_handlers: List[WebServiceAPIHandlerRegistry]
+    response_cache: OrderedDict[
+        Hashable, Tuple[float, int, List[Tuple[str, str]], bytes]
+    ]
+    response_cache_size: int = 0
 
     def __init__(self) -> None:
         super(WebServiceAPIServerBase, self).__init__()
         self.class_handlers = []
+        self.response_cache = OrderedDict()
+        self.response_cache_lock = threading.Lock()
 
     def on_configure(self) -> None:
         """
         On configuration, register handlers.
+
+        Also reads ``server.cache.size``, the number of responses from handlers marked
+        with ``@handlers.cache()`` to keep in memory. The default of 0 disables this.
         """
         self.register_all_handlers()
+        self.response_cache_size = int(self.configuration.get("server.cache.size", 0))
 
     def format_exception(
         self,
@@ -118,10 +148,12 @@ class WebServiceAPIServerBase(APIServerBase):
         result: Any,
         request: Union[Request, RequestWrapper],
         response: Union[Response, ResponseWrapper],
-    ) -> str:
+    ) -> Union[str, bytes]:
         """
         Formats a response. The base class stringifies this.
 
+        Implementations may return bytes to skip re-encoding the response body.
+
         This is from when a handler returns something, and indicates it wants the server to format it.
         """
         return str(result)
@@ -268,6 +300,97 @@ class WebServiceAPIServerBase(APIServerBase):
             raise cast(Exception, last_error)
         return handler
 
+    def get_response_cache_key(
+        self,
+        request: Union[Request, RequestWrapper],
+        handler: Union[WebServiceAPIHandler, WebServiceAPIBoundHandler],
+    ) -> Optional[Hashable]:
+        """
+        Gets the key to store a response under in the in-memory response cache.
+
+        Only GET requests to handlers marked with ``@handlers.cache()`` are cached. The key
+        includes the query and the headers that can change the response, so different users
+        never share an entry.
+
+        :returns Hashable: The cache key, or None if this response should not be cached.
+        """
+        if (
+            not self.response_cache_size
+            or not handler.cache_response
+            or handler.download_response
+            or request.method != "GET"
+        ):
+            return None
+        headers = request.headers
+        return (
+            request.path,
+            tuple(sorted(request.GET.items())),
+            headers.get("Authorization", None),
+            headers.get("Cookie", None),
+            headers.get("Accept", None),
+            "gzip" in headers.get("Accept-Encoding", ""),
+        )
+
+    def read_response_cache(
+        self, key: Hashable, response: Union[Response, ResponseWrapper]
+    ) -> bool:
+        """
+        Writes a cached response into the response object, if a fresh one exists.
+
+        :returns bool: Whether or not the response was served from the cache.
+        """
+        with self.response_cache_lock:
+            cached = self.response_cache.get(key, None)
+            if cached is None:
+                return False
+            expires, status_code, headerlist, body = cached
+            if expires < time.monotonic():
+                del self.response_cache[key]
+                return False
+            self.response_cache.move_to_end(key)
+        logger.debug("Serving response from cache.")
+        response.status_code = status_code
+        # Merged, so headers already set for this request are kept
+        for header_name, header_value in headerlist:
+            response.headers[header_name] = header_value
+        response.body = body
+        return True
+
+    def write_response_cache(
+        self,
+        key: Hashable,
+        handler: Union[WebServiceAPIHandler, WebServiceAPIBoundHandler],
+        response: Union[Response, ResponseWrapper],
+    ) -> None:
+        """
+        Stores a successful response in the cache, evicting the least recently used entries.
+
+        Responses that set cookies are not stored, as they belong to one client. Headers
+        that only apply to one connection or one point in time are not stored either.
+        Repeated headers are joined with commas.
+        """
+        if response.status_code != 200 or "Set-Cookie" in response.headers:
+            return
+        body = response.body
+        header_values: Dict[str, List[str]] = {}
+        for header_name, header_value in response.headers.items():
+            if header_name.lower() not in WebServiceAPIServerBase.UNCACHED_HEADERS:
+                header_values.setdefault(header_name, []).append(header_value)
+        cached = (
+            time.monotonic() + cast(int, handler.cache_response),
+            response.status_code,
+            [
+                (header_name, ", ".join(values))
+                for header_name, values in header_values.items()
+            ],
+            body,
+        )
+        with self.response_cache_lock:
+            self.response_cache[key] = cached
+            self.response_cache.move_to_end(key)
+            while len(self.response_cache) > self.response_cache_size:
+                self.response_cache.popitem(last=False)
+
     def redirect(
         self, response: Union[Response, ResponseWrapper], location: str, code: int = 301
     ) -> None:
@@ -303,77 +426,86 @@ class WebServiceAPIServerBase(APIServerBase):
                 accepted_encodings = request.headers.get("Accept-Encoding", "")
                 handler = self._find_handler_by_request(request)
                 self.parse_all(request, response, handler)
-                result = handler(self, request, response)
-                if handler.cache_response:
-                    response.headers["Cache-Control"] = "max-age={0}".format(
-                        handler.cache_response
-                    )
-                if handler.download_response:
-                    # Check to see if we can compress.
-                    if isinstance(result, io.IOBase):
-                        if "gzip" in accepted_encodings and handler.compress_response:
-                            # Compress the result itearatively.
-                            logger.debug("Iteratively compressing IO-based result.")
-                            response.app_iter = CompressedIterator(result)
-                            response.headers["Content-Encoding"] = "gzip"
-                        else:
-                            # The result of seek() is the byte offset of the IO handle. The first argument is the byte offset, and the second offset is the enum for the origin of the offset.
-                            # So, by calling seek(0, 2), we get the byte length of the IO handle (2 indicates the offset is from the end of the stream.)
-                            # We then call seek(0) to go back to 0 bytes from the beginning so webob can read the whole stream for the response.
-                            response.content_length = result.seek(0, 2)
-                            result.seek(0)
-                            response.app_iter = result
-                    elif isinstance(result, str) or isinstance(result, bytes):
-                        # mimetypes module guesses based on the file extension, and returns an array of types and confidence intervals.
-                        # We take the first one since it's the most likely.
-                        # In the case there is no result (like if the file has no extension), the module returns [None], and we won't set response.content_type.
-                        # The handler can still set content_type itself.
-                        if isinstance(result, bytes):
-                            result = decode(result)
-                        response.content_type = mimetypes.guess_type(result)[0]
-                        # Pass through the basename of the file.
-                        response.headers[
-                            "Content-Disposition"
-                        ] = 'inline; filename="{0}"'.format(os.path.basename(result))
-                        iterable = FileIterator(
-                            result,
-                            self.configuration.get("server.chunksize", 4096),
+                cache_key = self.get_response_cache_key(request, handler)
+                if cache_key is None or not self.read_response_cache(
+                    cache_key, response
+                ):
+                    result = handler(self, request, response)
+                    if handler.cache_response:
+                        response.headers["Cache-Control"] = "max-age={0}".format(
+                            handler.cache_response
                         )
-                        if "gzip" in accepted_encodings and handler.compress_response:
-                            # Compress the result iteratively
-                            logger.debug("Iteratively compressing file-based result.")
-                            response.app_iter = CompressedIterator(iterable)
-                            response.headers["Content-Encoding"] = "gzip"
+                    if handler.download_response:
+                        # Check to see if we can compress.
+                        if isinstance(result, io.IOBase):
+                            if "gzip" in accepted_encodings and handler.compress_response:
+                                # Compress the result itearatively.
+                                logger.debug("Iteratively compressing IO-based result.")
+                                response.app_iter = CompressedIterator(result)
+                                response.headers["Content-Encoding"] = "gzip"
+                            else:
+                                # The result of seek() is the byte offset of the IO handle. The first argument is the byte offset, and the second offset is the enum for the origin of the offset.
+                                # So, by calling seek(0, 2), we get the byte length of the IO handle (2 indicates the offset is from the end of the stream.)
+                                # We then call seek(0) to go back to 0 bytes from the beginning so webob can read the whole stream for the response.
+                                response.content_length = result.seek(0, 2)
+                                result.seek(0)
+                                response.app_iter = result
+                        elif isinstance(result, str) or isinstance(result, bytes):
+                            # mimetypes module guesses based on the file extension, and returns an array of types and confidence intervals.
+                            # We take the first one since it's the most likely.
+                            # In the case there is no result (like if the file has no extension), the module returns [None], and we won't set response.content_type.
+                            # The handler can still set content_type itself.
+                            if isinstance(result, bytes):
+                                result = decode(result)
+                            response.content_type = mimetypes.guess_type(result)[0]
+                            # Pass through the basename of the file.
+                            response.headers[
+                                "Content-Disposition"
+                            ] = 'inline; filename="{0}"'.format(os.path.basename(result))
+                            iterable = FileIterator(
+                                result,
+                                self.configuration.get("server.chunksize", 4096),
+                            )
+                            if "gzip" in accepted_encodings and handler.compress_response:
+                                # Compress the result iteratively
+                                logger.debug("Iteratively compressing file-based result.")
+                                response.app_iter = CompressedIterator(iterable)
+                                response.headers["Content-Encoding"] = "gzip"
+                            else:
+                                # This is a file path, we can easily query the FS for the size.
+                                response.content_length = os.path.getsize(result)
+                                response.app_iter = iterable
                         else:
-                            # This is a file path, we can easily query the FS for the size.
-                            response.content_length = os.path.getsize(result)
-                            response.app_iter = iterable
+                            raise BadResponseError(
+                                "Handler should have returned either a file path or io.IOBase, got {0} instead.".format(
+                                    type(result).__name__
+                                )
+                            )
                     else:
-                        raise BadResponseError(
-                            "Handler should have returned either a file path or io.IOBase, got {0} instead.".format(
-                                type(result).__name__
+                        if handler.format_response:
+                            logger.debug(
+                                "Handler indicates response should be formatted, calling highest priority format method."
                             )
-                        )
-                else:
-                    if handler.format_response:
-                        logger.debug(
-                            "Handler indicates response should be formatted, calling highest priority format method."
-                        )
-                        result = self.format_response(
-                            result=result, request=request, response=response
-                        )
-                    if "gzip" in accepted_encodings and handler.compress_response:
-                        logger.debug("Compressing unicode result.")
-                        response.headers["Content-Encoding"] = "gzip"
-                        if isinstance(result, str):
-                            result = result.encode("utf-8")
-                        elif not isinstance(result, bytes):
-                            result = str(result).encode("utf-8")
-                        response.app_iter = CompressedIterator(io.BytesIO(result))
-                    elif isinstance(result, str):
-                        response.text = result
-                    elif isinstance(result, bytes):
-                        response.body = result
+                            result = self.format_response(
+                                result=result, request=request, response=response
+                            )
+                        if result is None:
+                            # The handler wrote the response body itself.
+                            pass
+                        elif "gzip" in accepted_encodings and handler.compress_response:
+                            logger.debug("Compressing unicode result.")
+                            response.headers["Content-Encoding"] = "gzip"
+                            if isinstance(result, str):
+                                result = result.encode("utf-8")
+                            elif not isinstance(result, bytes):
+                                result = str(result).encode("utf-8")
+                            response.app_iter = CompressedIterator(io.BytesIO(result))
+                        elif isinstance(result, str):
+                            response.text = result
+                        elif isinstance(result, bytes):
+                            response.body = result
+                    if cache_key is not None:
+                        self.write_response_cache(cache_key, handler, response)
             except (
                 PermissionError,
                 AuthenticationError,
@@ -522,10 +654,21 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
     """
 
     methods: List[MethodBasedWebServiceAPIServerBase.WebServiceMethod]
+    methods_by_name: Optional[
+        Dict[str, MethodBasedWebServiceAPIServerBase.WebServiceMethod]
+    ]
 
     def __init__(self) -> None:
         super(MethodBasedWebServiceAPIServerBase, self).__init__()
         self.methods = []
+        self.methods_by_name = None
+
+    def methods_changed(self) -> None:
+        """
+        Called whenever a method is registered or signed. Implementations that derive
+        anything from ``self.methods`` should drop it here.
+        """
+        self.methods_by_name = None
 
     def _find_method_by_function(
         self, fn: Callable
@@ -546,12 +689,14 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
         """
         Finds a method by its name.
 
-        Will use either ``fn.__name__``, or the supplied name.
+        Will use either ``fn.__name__``, or the supplied name. The index is built on
+        first use and kept until the methods change.
         """
-        filtered_methods = [method for method in self.methods if method.name == name]
-        if not filtered_methods:
-            return None
-        return filtered_methods[0]
+        if self.methods_by_name is None:
+            self.methods_by_name = {}
+            for method in self.methods:
+                self.methods_by_name.setdefault(method.name, method)
+        return self.methods_by_name.get(name, None)
 
     def register(self, *args: Union[str, Callable]) -> Callable[[Callable], Callable]:
         """
@@ -610,6 +755,7 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
                 else:
                     fn.name = name
                     fn.registered = True
+                self.methods_changed()
                 return method
             except Exception as ex:
                 raise ConfigurationError(
@@ -681,6 +827,8 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
                 )
             else:
                 fn.response_signature = signature
+                fn.clear_signatures()
+            self.methods_changed()
             return method
 
         setattr(wrap, "signature", args[0])
@@ -730,6 +878,8 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
                 )
             else:
                 fn.signature.append(list(signature))  # type: ignore
+                fn.clear_signatures()
+            self.methods_changed()
             return method
 
         setattr(wrap, "signature", args)
@@ -783,6 +933,8 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
                 )
             else:
                 fn.response_named_signature = kwargs
+                fn.clear_signatures()
+            self.methods_changed()
             return method
 
         setattr(wrap, "signature", kwargs)
@@ -826,11 +978,26 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
                 )
             else:
                 fn.named_signature = kwargs
+                fn.clear_signatures()
+            self.methods_changed()
             return method
 
         setattr(wrap, "signature", kwargs)
         return wrap
 
+    def parse_request(
+        self, request: Request
+    ) -> Tuple[str, Optional[list], Optional[dict]]:
+        """
+        Parses a request into the method and arguments.
+
+        The base class passes the body to :meth:`parse_method_call`; implementations can override this to keep state from parsing on the request.
+
+        :param request webob.Request: The request object.
+        :returns tuple: A three-tuple of (str, list, dict), where the first argument is the method name, and the second the arguments, and the third the named arguments.
+        """
+        return self.parse_method_call(request.body)
+
     def parse_method_call(
         self, request: Request
     ) -> Tuple[str, Optional[list], Optional[dict]]:
@@ -843,7 +1010,9 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
         """
         raise NotImplementedError()
 
-    def format_response(self, result: Any, request: Request, response: Response) -> str:
+    def format_response(
+        self, result: Any, request: Request, response: Response
+    ) -> Union[str, bytes]:
         """
         Formats a response into something the requester is expecting.
 
@@ -865,7 +1034,7 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
         """
         raise NotImplementedError()
 
-    def handle(self, request: Request, response: Response) -> str:
+    def handle(self, request: Request, response: Response) -> Union[str, bytes]:
         """
         Handles a request by searching for a method to call, calling it, then formatting the response into the response object.
 
@@ -873,7 +1042,7 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
         :param response webob.Response: The response object.
         """
         try:
-            method, args, kwargs = self.parse_method_call(request.body)
+            method, args, kwargs = self.parse_request(request)
             if args is None:
                 args = []
             if kwargs is None:
@@ -935,6 +1104,67 @@ class MethodBasedWebServiceAPIServerBase(WebServiceAPIServerBase):
             self.named_signature = named_signature
             self.response_named_signature = response_named_signature
             self.registered = registered
+            self._help: Optional[Tuple[Optional[str], str]] = None
+            self._signatures: Optional[
+                Union[List[List[Type]], List[Dict[str, Type]]]
+            ] = None
+
+        @property
+        def help(self) -> str:
+            """
+            The docstring, with each line stripped and blank lines removed.
+
+            This is computed once and reused until the docstring changes.
+            """
+            if self._help is None or self._help[0] is not self.docstring:
+                help_text = ""
+                if self.docstring:
+                    help_text = "\n".join(
+                        [
+                            line.strip()
+                            for line in self.docstring.splitlines()
+                            if line.strip()
+                        ]
+                    )
+                self._help = (self.docstring, help_text)
+            return self._help[1]
+
+        def get_signatures(
+            self,
+        ) -> Optional[Union[List[List[Type]], List[Dict[str, Type]]]]:
+            """
+            Gets the full signatures of this method, with the response type first.
+
+            The result is cached; the ``sign_*`` decorators clear it when they change a signature.
+
+            :returns list: A list of lists of types, or a list containing the named signature.
+            :raises fruition.api.exceptions.ConfigurationError: when the method has no signature.
+            """
+            if self._signatures is not None:
+                return self._signatures
+            if self.named_signature:
+                self._signatures = [self.named_signature]
+                return self._signatures
+            elif not self.signature:
+                raise ConfigurationError(
+                    "Method {0} is missing a signature.".format(self.name)
+                )
+            signatures: List[List[Type]] = []
+            for signature in self.signature:
+                if self.response_signature is not None:
+                    signatures.append([self.response_signature] + signature)
+                else:
+                    signatures.append(signature)
+            if not signatures:
+                return None
+            self._signatures = signatures
+            return self._signatures
+
+        def clear_signatures(self) -> None:
+            """
+            Clears the cached result of :meth:`get_signatures`.
+            """
+            self._signatures = None
 
         def __call__(self, *args: Any, **kwargs: Any) -> Any:
             if self.signature:
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
 from re import compile, Pattern
+from string import Formatter
 from urllib.parse import unquote
-from typing import Optional, Callable, Any, Type, Iterable, Union, List
+from typing import (
+    Optional,
+    Callable,
+    Any,
+    Type,
+    Iterator,
+    Iterable,
+    Union,
+    List,
+    Dict,
+    Tuple,
+    FrozenSet,
+)
 from webob import Request, Response
 
 from collections import defaultdict
@@ -13,6 +26,8 @@ from fruition.api.exceptions import NotFoundError
 
 from fruition.api.server.base import APIServerBase
 
+MULTIPLE_SLASHES = compile(r"/{2,}")
+
 
 class WebServiceAPIHandler:
     """
@@ -24,7 +39,7 @@ class WebServiceAPIHandler:
         function: Callable,
         pattern: Optional[Union[str, Pattern]] = None,
         methods: List[str] = [],
-        bypass: List[Union[str, Type]] = [],
+        bypass: Iterable[Union[str, Type]] = (),
         reverse: Optional[tuple[str, str]] = None,
         format_response: bool = False,
         download_response: bool = False,
@@ -32,20 +47,81 @@ class WebServiceAPIHandler:
         compress_response: bool = False,
     ):
         self.function = function
-        self.pattern = pattern
+        self.pattern = compile(pattern) if isinstance(pattern, str) else pattern
         self.methods = methods
-        self.bypass = bypass
+        self.bypass: FrozenSet[Union[str, Type]] = frozenset(bypass)
         self.reverse = reverse
         self.compress_response = compress_response
         self.format_response = format_response
         self.download_response = download_response
         self.cache_response = cache_response
+        self._reverse_parts: Optional[
+            Tuple[str, Optional[List[Tuple[str, Optional[str]]]]]
+        ] = None
 
     def get_pattern(self) -> Optional[Pattern]:
+        """
+        Gets the compiled path pattern. Patterns given as strings are compiled once.
+        """
         if isinstance(self.pattern, str):
-            return compile(self.pattern)
+            self.pattern = compile(self.pattern)
         return self.pattern
 
+    def get_reverse_parts(self) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """
+        Splits the reverse path into (literal, field name) pairs, once per path.
+
+        Returns None when the path uses anything beyond plain field names
+        (format specs, conversions, attribute or index lookups,) in which case
+        it must be formatted in full.
+        """
+        if self.reverse is None:
+            return None
+        path = self.reverse[1]
+        if self._reverse_parts is None or self._reverse_parts[0] != path:
+            parts: Optional[List[Tuple[str, Optional[str]]]] = []
+            for literal, field_name, format_spec, conversion in Formatter().parse(
+                path
+            ):
+                if field_name is not None and (
+                    not field_name.isidentifier() or format_spec or conversion
+                ):
+                    parts = None
+                    break
+                parts.append((literal, field_name))  # type: ignore[union-attr]
+            self._reverse_parts = (path, parts)
+        return self._reverse_parts[1]
+
+    def format_reverse(
+        self,
+        _collapse_slashes: Callable[[str, str], str] = MULTIPLE_SLASHES.sub,
+        /,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Formats the reverse path with URL arguments.
+
+        Missing arguments are formatted as the empty string, repeated slashes are
+        collapsed and trailing slashes are stripped.
+        """
+        if self.reverse is None:
+            raise NotFoundError(f"Handler {self.function.__name__} has no reverse.")
+        parts = self.get_reverse_parts()
+        if parts is None:
+            format_dict = defaultdict(lambda: "")  # type: ignore
+            format_dict.update(kwargs)
+            resolved = self.reverse[1].format_map(format_dict)
+        else:
+            resolved = "".join(
+                [
+                    literal
+                    if field_name is None
+                    else literal + str(kwargs.get(field_name, ""))
+                    for literal, field_name in parts
+                ]
+            )
+        return _collapse_slashes("/", resolved).rstrip("/") or "/"
+
     def bind(self, **kwargs: Any) -> WebServiceAPIBoundHandler:
         return WebServiceAPIBoundHandler(self, **kwargs)
 
@@ -118,66 +194,82 @@ class WebServiceAPIHandlerRegistry:
     """
 
     handlers: List[WebServiceAPIHandler]
+    function_handlers: Dict[int, WebServiceAPIHandler]
 
     def __init__(self) -> None:
         self.handlers = []
+        self.function_handlers = {}
 
     def _find_handler_by_function(self, fn: Callable) -> WebServiceAPIHandler:
         """
         Retrieves a handler by a function.
 
+        Handlers are indexed by the identity of their function; handlers appended
+        without going through :meth:`create_or_modify_handler` are found by scanning.
+
         :param fn callable: The function to check for.
         :returns WebServiceAPIHandler: The handler to return.
         """
+        handler = self.function_handlers.get(id(fn), None)
+        if handler is not None:
+            return handler
         for handler in self.handlers:
             if handler.function is fn:
+                self.function_handlers[id(fn)] = handler
                 return handler
         raise NotFoundError(f"Cannot find function {fn}")
 
     def _find_handler_by_request(
-        self, method: str, path: str
+        self,
+        method: str,
+        path: str,
+        _unquote: Callable[[str], str] = unquote,
+        _debug: Callable[..., None] = logger.debug,
+        /,
     ) -> Union[WebServiceAPIHandler, WebServiceAPIBoundHandler]:
         """
         Retrieves the handler matching a method and path.
 
+        The trailing positional-only arguments bind module-level names as locals
+        for the request path; they should not be passed.
+
         :param method str: The method - GET, PUT, POST, etc.
         :param path str: The request path.
         :returns WebServiceAPIHandler: The method that handles the request.
         """
+        method = method.upper()
         for handler in self.handlers:
             handler_pattern = handler.get_pattern()
             if handler_pattern is not None:
                 match = handler_pattern.match(path)
-                if match and method.upper() in handler.methods:
-                    logger.debug(
+                if match and method in handler.methods:
+                    _debug(
                         "Handler {0} matched on path {1} and method {2}".format(
-                            handler.function.__name__, path, method.upper()
+                            handler.function.__name__, path, method
                         )
                     )
                     groups = match.groupdict()
                     kwargs = dict(
                         [
-                            (key, None if groups[key] is None else unquote(groups[key]))
+                            (key, None if groups[key] is None else _unquote(groups[key]))
                             for key in groups
                         ]
                     )
                     return handler.bind(**kwargs)
                 elif match:
-                    logger.debug(
+                    _debug(
                         "Handler {0} matched on path {1}, but not method {2}".format(
-                            handler.function.__name__, path, method.upper()
+                            handler.function.__name__, path, method
                         )
                     )
                 else:
-                    logger.debug(
+                    _debug(
                         "Handler {0} did not match on path {1} (tried {2})".format(
                             handler.function.__name__, path, handler.pattern
                         )
                     )
         raise NotFoundError(
-            "No handler found matching method {0} and path {1}.".format(
-                method.upper(), path
-            )
+            "No handler found matching method {0} and path {1}.".format(method, path)
         )
 
     def create_handler(self, fn: Callable, **kwargs: Any) -> WebServiceAPIHandler:
@@ -211,10 +303,11 @@ class WebServiceAPIHandlerRegistry:
 
         This can be overridden by extending classes to change behavior.
         """
-        try:
+        if id(fn) in self.function_handlers:
             return self.modify_handler(fn, **kwargs)
-        except NotFoundError:
-            return self.create_handler(fn, **kwargs)
+        handler = self.create_handler(fn, **kwargs)
+        self.function_handlers[id(fn)] = handler
+        return handler
 
     def path(self, pattern: Union[str, Pattern]) -> Callable[[Callable], Callable]:
         """
@@ -385,7 +478,9 @@ class WebServiceAPIHandlerRegistry:
         :param classes tuple: Any number of class names to ignore. These can be fully qualified strings, like `fruition.api.middleware.webservice.authentication.basic.BasicAuthenticationMiddleware` or an actual class.
         :returns function: Returns the wrapper function.
         """
-        classlist = [cls if isinstance(cls, type) else resolve(cls) for cls in classes]
+        classlist = frozenset(
+            [cls if isinstance(cls, type) else resolve(cls) for cls in classes]
+        )
 
         def wrap(fn: Callable) -> Callable:
             self.create_or_modify_handler(fn, bypass=classlist)
@@ -404,32 +499,11 @@ class WebServiceAPIHandlerRegistry:
         """
         for handler in self.handlers:
             if handler.reverse is not None and handler.reverse[0] == view_name:
-                format_dict = defaultdict(lambda: "")  # type: ignore
-                format_dict.update(kwargs)
-                resolved = handler.reverse[1].format_map(format_dict)
-                while resolved.find("//") != -1:
-                    resolved = resolved.replace("//", "/")
-                while resolved and resolved[-1] == "/":
-                    resolved = resolved[:-1]
-                if not resolved:
-                    return "/"
-                return resolved
+                return handler.format_reverse(**kwargs)
         raise NotFoundError("No view with name {0}".format(view_name))
 
-    def __iter__(self) -> Iterable[WebServiceAPIHandler]:
-        self.index = 0
-        while True:
-            try:
-                yield next(self)
-            except StopIteration:
-                return
-
-    def __next__(self) -> WebServiceAPIHandler:
-        if self.index >= len(self.handlers):
-            raise StopIteration()
-        result = self.handlers[self.index]
-        self.index += 1
-        return result
+    def __iter__(self) -> Iterator[WebServiceAPIHandler]:
+        return iter(self.handlers)
 
     def __call__(
         self,
@@ -6,7 +6,7 @@ from typing import Any, Optional
 
 from fruition.database.orm import ORMObject
 from fruition.api.server.webservice.base import WebServiceAPIServerBase
-from fruition.util.strings import Serializer
+from fruition.util.strings import Serializer, dump_json_bytes
 
 
 class JSONWebServiceAPIServer(WebServiceAPIServerBase):
@@ -21,7 +21,7 @@ class JSONWebServiceAPIServer(WebServiceAPIServerBase):
         result: Any,
         request: Request,
         response: Response,
-    ) -> str:
+    ) -> bytes:
         """
         Override format_response to respond per JSONAPI spec.
         """
@@ -49,9 +49,7 @@ class JSONWebServiceAPIServer(WebServiceAPIServerBase):
         if hasattr(response, "meta"):
             response_meta.update(response.meta)
 
-        return json.dumps(
-            {"meta": response_meta, "data": result}, default=Serializer.serialize
-        )
+        return dump_json_bytes({"meta": response_meta, "data": result})
 
     def format_exception(
         self,
@@ -71,7 +69,7 @@ class JSONWebServiceAPIServer(WebServiceAPIServerBase):
                 error_code = WebServiceAPIServerBase.EXCEPTION_CODES[error_class]
                 break
 
-        return json.dumps(
+        return dump_json_bytes(
             {
                 "errors": [
                     {
@@ -80,9 +78,8 @@ class JSONWebServiceAPIServer(WebServiceAPIServerBase):
                         "detail": str(exception),
                     }
                 ]
-            },
-            default=Serializer.serialize,
-        )
+            }
+        ).decode("utf-8")
 
     def parse(
         self,
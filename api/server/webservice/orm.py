@@ -1,10 +1,12 @@
 from webob import Request, Response
 from typing import Any
 
-from fruition.util.strings import Serializer
+from fruition.util.strings import dump_json_bytes
 from fruition.api.server.webservice.base import WebServiceAPIServerBase
 from fruition.api.middleware.database.orm import ORMMiddlewareBase
 
+__all__ = ["ORMWebServiceAPIServer"]
+
 
 class ORMWebServiceAPIServer(WebServiceAPIServerBase, ORMMiddlewareBase):
     """
@@ -16,17 +18,12 @@ class ORMWebServiceAPIServer(WebServiceAPIServerBase, ORMMiddlewareBase):
         result: Any,
         request: Request,
         response: Response,
-    ) -> str:
+    ) -> bytes:
+        include = request.GET.getall("include")
         if isinstance(result, list):
-            return Serializer.serialize(
-                [
-                    r.format(include=request.GET.getall("include"))
-                    for r in result
-                    if r is not None
-                ]
+            return dump_json_bytes(
+                [r.format(include=include) for r in result if r is not None]
             )
         if result is not None:
-            return Serializer.serialize(
-                result.format(include=request.GET.getall("include"))
-            )
-        return ""
+            return dump_json_bytes(result.format(include=include))
+        return b""
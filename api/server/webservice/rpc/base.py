@@ -2,10 +2,7 @@ from webob import Request, Response
 
 from fruition.api.server.webservice.base import MethodBasedWebServiceAPIServerBase
 from fruition.api.server.webservice.handler import WebServiceAPIHandlerRegistry
-from fruition.api.exceptions import (
-    UnsupportedMethodError,
-    ConfigurationError,
-)
+from fruition.api.exceptions import UnsupportedMethodError
 from typing import Type, Optional, Union, List, Dict
 
 
@@ -68,23 +65,7 @@ class RPCServerBase(MethodBasedWebServiceAPIServerBase):
         fn = self._find_method_by_name(fn_name)
         if fn is None:
             raise UnsupportedMethodError("{0} does not exist.".format(fn_name))
-        if fn.named_signature:
-            return [fn.named_signature]
-        elif not fn.signature:
-            raise ConfigurationError(
-                "Method {0} is missing a signature.".format(fn_name)
-            )
-        signatures: List[List[Type]] = []
-        for signature in fn.signature:
-            if fn.response_signature is not None:
-                signatures.append([fn.response_signature] + signature)
-            else:
-                signatures.append(signature)
-        if not fn.signature and fn.response_signature:
-            signatures = [[fn.response_signature]]
-        if not signatures:
-            return None
-        return signatures
+        return fn.get_signatures()
 
     def method_help(self, fn_name: str) -> str:
         """
@@ -97,15 +78,11 @@ class RPCServerBase(MethodBasedWebServiceAPIServerBase):
         fn = self._find_method_by_name(fn_name)
         if fn is None:
             raise UnsupportedMethodError("{0} does not exist.".format(fn_name))
-        if not fn.docstring:
-            return ""
-        return "\n".join(
-            [line.strip() for line in fn.docstring.splitlines() if line.strip()]
-        )
+        return fn.help
 
     @handlers.path("/RPC2")
     @handlers.methods("POST")
-    def rpc(self, request: Request, response: Response) -> str:
+    def rpc(self, request: Request, response: Response) -> Union[str, bytes]:
         """
         Handles a request by searching for a method to call, calling it, then formatting the response into the response object.
 
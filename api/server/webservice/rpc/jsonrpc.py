@@ -1,13 +1,29 @@
 import datetime
+import functools
 import json
 
-from typing import Type, Any, Optional
+from types import MappingProxyType
+from typing import Type, Any, Optional, Union, Mapping, Tuple
 
 from webob import Request, Response
 
 from fruition.api.server.webservice.rpc.base import RPCServerBase
 from fruition.api.exceptions import UnsupportedMethodError, BadRequestError
-from fruition.util.strings import Serializer, decode
+from fruition.util.strings import Serializer, dump_json_bytes, load_json
+
+JSONRPC_TYPENAMES: Mapping[Type, str] = MappingProxyType(
+    {
+        int: "int",
+        float: "float",
+        datetime.datetime: "string",
+        bytes: "string",
+        str: "string",
+        list: "array",
+        dict: "object",
+        bool: "boolean",
+        type(None): "null",
+    }
+)
 
 
 class JSONRPCSerializer(Serializer):
@@ -44,7 +60,14 @@ class JSONRPCServer(RPCServerBase):
     8
     """
 
+    ERROR_CODES: Tuple[Tuple[Type[Exception], int], ...] = (
+        (json.decoder.JSONDecodeError, -32700),
+        (BadRequestError, -32600),
+        (UnsupportedMethodError, -32601),
+    )
+
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def map_typename(_type: Type) -> str:
         """
         Takes a python type and turns it into a string version of it.
@@ -61,17 +84,7 @@ class JSONRPCServer(RPCServerBase):
         :returns str: The typename of the object.
         :raises TypeError: When no type information is available.
         """
-        typename = {
-            int: "int",
-            float: "float",
-            datetime.datetime: "string",
-            bytes: "string",
-            str: "string",
-            list: "array",
-            dict: "object",
-            bool: "boolean",
-            type(None): "null",
-        }.get(_type, None)
+        typename = JSONRPC_TYPENAMES.get(_type, None)
 
         if typename is None:
             raise TypeError(
@@ -80,38 +93,90 @@ class JSONRPCServer(RPCServerBase):
         return typename
 
     @staticmethod
-    def parse_method_call(body: str) -> tuple[str, Optional[list], Optional[dict]]:
+    def serialize_value(value: Any) -> Any:
+        """
+        The ``default`` callback used when dumping responses.
+
+        orjson handles dates, times and UUIDs itself, so in practice this is only
+        reached for ``type`` objects (from signatures and help,) which are mapped
+        directly rather than walking the serializer's format tables.
+
+        >>> from fruition.api.server.webservice.rpc.jsonrpc import JSONRPCServer
+        >>> JSONRPCServer.serialize_value(dict)
+        'object'
+        >>> JSONRPCServer.serialize_value(b"bytes")
+        'bytes'
+
+        :param value object: The value that could not be natively serialized.
+        :returns object: The serializable version of the value.
+        """
+        if isinstance(value, type):
+            return JSONRPCServer.map_typename(value)
+        return JSONRPCSerializer.serialize(value)
+
+    def parse_request(
+        self, request: Request
+    ) -> tuple[str, Optional[list], Optional[dict]]:
+        """
+        Parses the request body once, keeping the request ID on the request for :meth:`format_response`.
+        """
+        parsed = load_json(request.body)
+        if isinstance(parsed, dict):
+            setattr(request, "jsonrpc_id", parsed.get("id", None))
+        return self.parse_method_call(parsed)
+
+    @staticmethod
+    def parse_method_call(
+        body: Union[str, bytes, dict]
+    ) -> tuple[str, Optional[list], Optional[dict]]:
         """
         Takes a string JSON body, and parses it to find the method name and parameters.
 
+        An already-parsed request dictionary is also accepted.
+
         >>> import json
         >>> from fruition.api.server.webservice.rpc.jsonrpc import JSONRPCServer
         >>> JSONRPCServer.parse_method_call(json.dumps({"jsonrpc": "2.0", "method": "add", "params": [1, 2]}))
         ('add', [1, 2], {})
         >>> JSONRPCServer.parse_method_call(json.dumps({"jsonrpc": "2.0", "method": "pow", "params": {"base": 2, "exponent": 3}}))
         ('pow', [], {'base': 2, 'exponent': 3})
-
-        :param body str: The body of a request.
+        >>> from fruition.util.helpers import expect_exception
+        >>> from fruition.api.exceptions import BadRequestError
+        >>> try:
+        ...     JSONRPCServer.parse_method_call('{"jsonrpc": "1.0", "method": "add"}')
+        ... except BadRequestError as ex:
+        ...     print(ex)
+        Unsupported JSONRPC version '1.0', must be '2.0'.
+        >>> expect_exception(BadRequestError)(lambda: JSONRPCServer.parse_method_call('{"jsonrpc": "2.0"}'))
+
+        :param body str: The body of a request, or the parsed body.
         :returns tuple: A three-tuple of (str, list, dict), the first of which is the method name, the second is a list of all parsed parameters if positional parameters are sent, the third is a dict of all parsed parameters if named parameters are sent.
-        :raises fruition.api.exceptions.BadRequestError: When the method name is not present, or the json rpc specifier is not present.
-        :raises json.decoder.JSONDecodeError: When the JSON is not well-formed.
+        :raises fruition.api.exceptions.BadRequestError: When the method name is not present, or the json rpc specifier is not present or not '2.0'.
+        :raises json.decoder.JSONDecodeError: When the JSON is not well-formed (orjson's error is a subclass.)
         """
-        request = json.loads(body)
-        if request.get("jsonrpc", None) != "2.0":
+        request = body if isinstance(body, dict) else load_json(body)
+        try:
+            version = request["jsonrpc"]
+            method = request["method"]
+        except KeyError as ex:
+            if ex.args[0] == "method":
+                raise BadRequestError("Missing method name in request.")
             raise BadRequestError(
                 "Missing JSONRPC specifier. Must be present and set to '2.0'."
             )
-        if "method" not in request:
-            raise BadRequestError("Missing method name in request.")
+        if version != "2.0":
+            raise BadRequestError(
+                "Unsupported JSONRPC version '{0}', must be '2.0'.".format(version)
+            )
         params = request.get("params", None)
         if params is None:
-            return request["method"], [], {}
-        elif type(params) is dict:
-            params = Serializer.deserialize(params)
-            return request["method"], [], params
+            return method, [], {}
         elif type(params) is list:
             params = Serializer.deserialize(params)
-            return request["method"], params, {}
+            return method, params, {}
+        elif type(params) is dict:
+            params = Serializer.deserialize(params)
+            return method, [], params
         else:
             raise BadRequestError(
                 "Bad 'params' format. Must be object or array, got {0} instead.".format(
@@ -119,24 +184,29 @@ class JSONRPCServer(RPCServerBase):
                 )
             )
 
-    def format_response(self, result: Any, request: Request, response: Response) -> str:
+    def format_response(
+        self, result: Any, request: Request, response: Response
+    ) -> bytes:
         """
         Formats a method response from the dispatcher.
 
         :param response object: The response from the method.
         :param request webob.Request: The request from the dispatcher.
-        :returns str: The response.
+        :returns bytes: The response.
         """
-        if result is not None:
-            id = json.loads(request.body).get("id", None)
-            if id is not None:
-                return decode(
-                    json.dumps(
-                        {"jsonrpc": "2.0", "result": result, "id": id},
-                        default=JSONRPCSerializer.serialize,
-                    )
-                )
-        return ""
+        if result is None:
+            return b""
+        try:
+            id = getattr(request, "jsonrpc_id")
+        except AttributeError:
+            id = load_json(request.body).get("id", None)
+        if id is None:
+            # Notifications are never answered, so don't build a response.
+            return b""
+        return dump_json_bytes(
+            {"jsonrpc": "2.0", "result": result, "id": id},
+            default=JSONRPCServer.serialize_value,
+        )
 
     def format_exception(
         self, exception: Exception, request: Request, response: Response
@@ -147,16 +217,10 @@ class JSONRPCServer(RPCServerBase):
         :param ex exception: The exception thrown.
         :returns str: The formatted exception response.
         """
-        code = -32500
-        if isinstance(exception, json.decoder.JSONDecodeError):
-            code = -32700
-        if isinstance(exception, UnsupportedMethodError):
-            code = -32601
-        if isinstance(exception, BadRequestError):
-            code = -32600
-        return decode(
-            json.dumps(
-                {"jsonrpc": "2.0", "code": code, "message": str(exception)},
-                default=JSONRPCSerializer.serialize,
-            )
+        code = next(
+            (c for t, c in self.ERROR_CODES if isinstance(exception, t)), -32500
         )
+        return dump_json_bytes(
+            {"jsonrpc": "2.0", "code": code, "message": str(exception)},
+            default=JSONRPCSerializer.serialize,
+        ).decode("utf-8")
@@ -1,16 +1,119 @@
+import re
 import datetime
+import functools
 import base64
-import sys
 import lxml.etree as ET
 
 from webob import Request, Response
-from typing import Type, Iterable, Any, Optional
+from xml.sax.saxutils import escape
+from types import MappingProxyType
+from typing import Type, Any, Optional, Union, Callable, Dict, Mapping, Tuple
 
 from lxml.builder import E
 from fruition.api.server.webservice.rpc.base import RPCServerBase
 from fruition.api.exceptions import UnsupportedMethodError, BadRequestError
 from fruition.util.strings import decode
 
+XMLRPC_TYPENAMES: Mapping[Type, str] = MappingProxyType(
+    {
+        int: "int",
+        float: "double",
+        datetime.datetime: "dateTime.iso8601",
+        bytes: "base64",
+        str: "string",
+        list: "array",
+        dict: "struct",
+        bool: "boolean",
+    }
+)
+
+# Element factories, bound once; each ``E.<tag>`` access builds a new partial.
+E_VALUE = E.value
+E_BOOLEAN = E.boolean
+E_INT = E.int
+E_STRING = E.string
+E_BASE64 = E.base64
+E_DOUBLE = E.double
+E_PARAM = E.param
+E_PARAMS = E.params
+E_DATA = E.data
+E_ARRAY = E.array
+E_STRUCT = E.struct
+E_MEMBER = E.member
+E_NAME = E.name
+E_METHOD_RESPONSE = E.methodResponse
+E_FAULT = E.fault
+E_DATETIME = getattr(E, "dateTime.iso8601")
+
+XMLRPC_EMPTY_RESPONSE = b"<methodResponse><params/></methodResponse>"
+XMLRPC_RESPONSE_TEMPLATE = (
+    "<methodResponse><params><param>{0}</param></params></methodResponse>"
+)
+
+
+# Characters XML 1.0 doesn't allow, which lxml refuses when building elements.
+XML_INVALID_CHARACTERS = re.compile(
+    "[^\t\n\r\u0020-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]"
+)
+# Carriage returns would be read back as newlines, lxml writes them as references too.
+XML_TEXT_ENTITIES = {"\r": "&#13;"}
+
+
+def escape_text(value: str) -> str:
+    """
+    Escapes a string for use as XML text, the same way lxml would.
+
+    >>> from fruition.api.server.webservice.rpc.xmlrpc import escape_text
+    >>> escape_text("a < b & c]]>\\r")
+    'a &lt; b &amp; c]]&gt;&#13;'
+    >>> from fruition.util.helpers import expect_exception
+    >>> expect_exception(ValueError)(lambda: escape_text("a\\x01b"))
+
+    :raises ValueError: When the string contains characters XML can't represent.
+    """
+    if XML_INVALID_CHARACTERS.search(value) is not None:
+        raise ValueError(
+            "All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters"
+        )
+    return escape(value, XML_TEXT_ENTITIES)
+
+
+def format_iso8601(value: datetime.datetime) -> str:
+    """
+    Formats a datetime the way XML-RPC expects, i.e. 20180101T00:00:00.
+
+    This avoids the format-string interpretation of ``strftime``.
+
+    >>> import datetime
+    >>> from fruition.api.server.webservice.rpc.xmlrpc import format_iso8601
+    >>> format_iso8601(datetime.datetime(2018, 1, 2, 3, 4, 5))
+    '20180102T03:04:05'
+    """
+    return f"{value.year:04d}{value.month:02d}{value.day:02d}T{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+
+
+def parse_iso8601(value: str) -> datetime.datetime:
+    """
+    Parses a datetime formatted the way XML-RPC sends it, i.e. 20180101T00:00:00.
+
+    The fixed-width form is sliced directly; anything else goes through ``strptime``.
+
+    >>> from fruition.api.server.webservice.rpc.xmlrpc import parse_iso8601
+    >>> parse_iso8601("20180102T03:04:05")
+    datetime.datetime(2018, 1, 2, 3, 4, 5)
+    """
+    value = value.strip()
+    if len(value) == 17 and value[8] == "T" and value[11] == ":" and value[14] == ":":
+        return datetime.datetime(
+            int(value[0:4]),
+            int(value[4:6]),
+            int(value[6:8]),
+            int(value[9:11]),
+            int(value[12:14]),
+            int(value[15:17]),
+        )
+    return datetime.datetime.strptime(value, "%Y%m%dT%H:%M:%S")
+
 
 class XMLRPCServer(RPCServerBase):
     """
@@ -30,7 +133,62 @@ class XMLRPCServer(RPCServerBase):
     3
     """
 
+    ERROR_CODES: Tuple[Tuple[Type[Exception], int], ...] = (
+        (ET.XMLSyntaxError, -32700),
+        (BadRequestError, -32600),
+        (UnsupportedMethodError, -32601),
+    )
+
+    # Ordered so that subclasses resolve as they would through isinstance, i.e. bool before int.
+    VALUE_FORMATS: Dict[Type, Callable[[Any], ET._Element]] = {
+        bool: lambda p: E_VALUE(E_BOOLEAN("1" if p else "0")),
+        int: lambda p: E_VALUE(E_INT(str(p))),
+        str: lambda p: E_VALUE(E_STRING(p)),
+        bytes: lambda p: E_VALUE(E_BASE64(base64.b64encode(p).decode("ascii"))),
+        float: lambda p: E_VALUE(E_DOUBLE(str(p))),
+        datetime.datetime: lambda p: E_VALUE(E_DATETIME(format_iso8601(p))),
+        list: lambda p: XMLRPCServer.format_array(p),
+        tuple: lambda p: XMLRPCServer.format_array(p),
+        dict: lambda p: XMLRPCServer.format_struct(p),
+    }
+
+    VALUE_STRING_FORMATS: Dict[Type, Callable[[Any], str]] = {
+        bool: lambda p: "<value><boolean>{0}</boolean></value>".format(
+            "1" if p else "0"
+        ),
+        int: lambda p: "<value><int>{0}</int></value>".format(str(p)),
+        str: lambda p: "<value><string>{0}</string></value>".format(escape_text(p)),
+        bytes: lambda p: "<value><base64>{0}</base64></value>".format(
+            base64.b64encode(p).decode("ascii")
+        ),
+        float: lambda p: "<value><double>{0}</double></value>".format(str(p)),
+        datetime.datetime: lambda p: (
+            "<value><dateTime.iso8601>{0}</dateTime.iso8601></value>".format(
+                format_iso8601(p)
+            )
+        ),
+        list: lambda p: XMLRPCServer.format_array_string(p),
+        tuple: lambda p: XMLRPCServer.format_array_string(p),
+        dict: lambda p: XMLRPCServer.format_struct_string(p),
+    }
+
+    VALUE_PARSERS: Dict[str, Callable[[ET._Element], Any]] = {
+        "value": lambda n: XMLRPCServer.parse_value(n[0]),
+        "int": lambda n: int(n.text),
+        "i4": lambda n: int(n.text),
+        "boolean": lambda n: n.text == "1" or n.text == "true",
+        "double": lambda n: float(n.text),
+        "base64": lambda n: base64.b64decode(n.text),
+        "dateTime.iso8601": lambda n: parse_iso8601(n.text),
+        "string": lambda n: n.text,
+        "array": lambda n: [
+            XMLRPCServer.parse_value(v) for v in n[0] if v.tag == "value"
+        ],
+        "struct": lambda n: XMLRPCServer.parse_struct(n),
+    }
+
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def map_typename(_type: Type) -> str:
         """
         Takes a python type and turns it into a string version of it.
@@ -47,16 +205,7 @@ class XMLRPCServer(RPCServerBase):
         :returns str: The typename of the object.
         :raises TypeError: When no type information is available.
         """
-        typename = {
-            int: "int",
-            float: "double",
-            datetime.datetime: "dateTime.iso8601",
-            bytes: "base64",
-            str: "string",
-            list: "array",
-            dict: "struct",
-            bool: "boolean",
-        }.get(_type, None)
+        typename = XMLRPC_TYPENAMES.get(_type, None)
 
         if typename is None:
             raise TypeError(
@@ -85,51 +234,136 @@ class XMLRPCServer(RPCServerBase):
         :return lxml.etree._Element: The <parameter/> element.
         :raises fruition.api.exceptions.BadRequestError: When the parameter is not a known RPC type.
         """
+        return E_PARAM(XMLRPCServer.format_value(parameter))
 
-        def _format_parameter(
-            value: Any, name: Optional[str] = None
-        ) -> Iterable[ET._Element]:
-            def _format_value(p: Any) -> ET._Element:
-                if isinstance(p, type):
-                    return E.value(E.string(XMLRPCServer.map_typename(p)))
-                elif isinstance(p, bool):
-                    return E.value(E.boolean("1" if p else "0"))
-                elif isinstance(p, int):
-                    return E.value(E.int(str(p)))
-                elif isinstance(p, str):
-                    return E.value(E.string(p))
-                elif isinstance(p, bytes):
-                    return E.value(
-                        E.base64(base64.b64encode(p).decode(sys.getdefaultencoding()))
-                    )
-                elif isinstance(p, float):
-                    return E.value(E.double(str(p)))
-                elif isinstance(p, datetime.datetime):
-                    return E.value(E("dateTime.iso8601", p.strftime("%Y%m%dT%H:%M:%S")))
-                elif isinstance(p, list) or isinstance(p, tuple):
-                    # Have to be clunky as we can't unpack list comprehensions
-                    dnode = E.data()
-                    for l in p:
-                        dnode.append(*_format_parameter(l))
-                    return E.value(E.array(dnode))
-                elif isinstance(p, dict):
-                    return E.value(
-                        E.struct(*[E.member(*_format_parameter(p[k], k)) for k in p])
-                    )
+    @staticmethod
+    def format_value(value: Any) -> ET._Element:
+        """
+        Formats a single datum into a <value/> node.
+
+        The formatter is found by the exact type of the value in ``VALUE_FORMATS``; only
+        types and subclasses fall back to ``isinstance`` checks.
+
+        >>> import lxml.etree as ET
+        >>> from collections import OrderedDict
+        >>> from fruition.api.server.webservice.rpc.xmlrpc import XMLRPCServer
+        >>> ET.tostring(XMLRPCServer.format_value(True))
+        b'<value><boolean>1</boolean></value>'
+        >>> ET.tostring(XMLRPCServer.format_value(OrderedDict(baz=1.5)))
+        b'<value><struct><member><value><double>1.5</double></value><name>baz</name></member></struct></value>'
+        >>> ET.tostring(XMLRPCServer.format_value(int))
+        b'<value><string>int</string></value>'
+
+        :param value object: Any value of the acceptable list of value types.
+        :return lxml.etree._Element: The <value/> element.
+        :raises fruition.api.exceptions.BadRequestError: When the value is not a known RPC type.
+        """
+        formatter = XMLRPCServer.VALUE_FORMATS.get(type(value), None)
+        if formatter is None:
+            if isinstance(value, type):
+                return E_VALUE(E_STRING(XMLRPCServer.map_typename(value)))
+            for value_type in XMLRPCServer.VALUE_FORMATS:
+                if isinstance(value, value_type):
+                    formatter = XMLRPCServer.VALUE_FORMATS[value_type]
+                    break
+            else:
                 raise BadRequestError(
                     "Cannot encode type {0} into XMLRPC response.".format(
-                        type(p).__name__
+                        type(value).__name__
                     )
                 )
+        return formatter(value)
+
+    @staticmethod
+    def format_array(value: Union[list, tuple]) -> ET._Element:
+        """
+        Formats a list or tuple into an <array/> <value/> node.
+        """
+        format_value = XMLRPCServer.format_value
+        dnode = E_DATA()
+        dnode.extend([format_value(item) for item in value])
+        return E_VALUE(E_ARRAY(dnode))
 
-            def _format_name(n: Any) -> ET._Element:
-                return E.name(str(n))
+    @staticmethod
+    def format_struct(value: dict) -> ET._Element:
+        """
+        Formats a dictionary into a <struct/> <value/> node.
+        """
+        return E_VALUE(
+            E_STRUCT(
+                *[
+                    E_MEMBER(XMLRPCServer.format_value(value[key]), E_NAME(str(key)))
+                    for key in value
+                ]
+            )
+        )
+
+    @staticmethod
+    def format_value_string(value: Any) -> str:
+        """
+        Formats a single datum directly into a serialized <value/> node.
+
+        This produces the same document as serializing :meth:`format_value`, without
+        building an element tree first, and is used for responses.
+
+        >>> import datetime
+        >>> from fruition.api.server.webservice.rpc.xmlrpc import XMLRPCServer
+        >>> XMLRPCServer.format_value_string(["a&b", 5, datetime.datetime(2018, 1, 1)])
+        '<value><array><data><value><string>a&amp;b</string></value><value><int>5</int></value><value><dateTime.iso8601>20180101T00:00:00</dateTime.iso8601></value></data></array></value>'
+        >>> XMLRPCServer.format_value_string({"bar": False})
+        '<value><struct><member><value><boolean>0</boolean></value><name>bar</name></member></struct></value>'
+
+        :param value object: Any value of the acceptable list of value types.
+        :return str: The serialized <value/> node.
+        :raises fruition.api.exceptions.BadRequestError: When the value is not a known RPC type.
+        """
+        formatter = XMLRPCServer.VALUE_STRING_FORMATS.get(type(value), None)
+        if formatter is None:
+            if isinstance(value, type):
+                return "<value><string>{0}</string></value>".format(
+                    XMLRPCServer.map_typename(value)
+                )
+            for value_type in XMLRPCServer.VALUE_STRING_FORMATS:
+                if isinstance(value, value_type):
+                    formatter = XMLRPCServer.VALUE_STRING_FORMATS[value_type]
+                    break
+            else:
+                raise BadRequestError(
+                    "Cannot encode type {0} into XMLRPC response.".format(
+                        type(value).__name__
+                    )
+                )
+        return formatter(value)
 
-            if name is not None:
-                return (_format_value(value), _format_name(name))
-            return (_format_value(value),)
+    @staticmethod
+    def format_array_string(value: Union[list, tuple]) -> str:
+        """
+        Formats a list or tuple into a serialized <array/> <value/> node.
+        """
+        if not value:
+            return "<value><array><data/></array></value>"
+        return "<value><array><data>{0}</data></array></value>".format(
+            "".join([XMLRPCServer.format_value_string(item) for item in value])
+        )
 
-        return E.param(*_format_parameter(parameter))
+    @staticmethod
+    def format_struct_string(value: dict) -> str:
+        """
+        Formats a dictionary into a serialized <struct/> <value/> node.
+        """
+        if not value:
+            return "<value><struct/></value>"
+        return "<value><struct>{0}</struct></value>".format(
+            "".join(
+                [
+                    "<member>{0}<name>{1}</name></member>".format(
+                        XMLRPCServer.format_value_string(value[key]),
+                        escape_text(str(key)),
+                    )
+                    for key in value
+                ]
+            )
+        )
 
     @staticmethod
     def format_parameters(*parameters: Any) -> ET._Element:
@@ -144,7 +378,7 @@ class XMLRPCServer(RPCServerBase):
         :param parameters tuple: Any number of parameters.
         :returns lxml.etree._Element: The <params/> node.
         """
-        return E.params(
+        return E_PARAMS(
             *[XMLRPCServer.format_parameter(parameter) for parameter in parameters]
         )
 
@@ -203,57 +437,93 @@ class XMLRPCServer(RPCServerBase):
         :returns list: A list of all parameters in a request.
         :raises fruition.api.exceptions.BadRequestError: When the type of the value is incorrect.
         """
+        parse_parameter = XMLRPCServer.parse_parameter
+        return [parse_parameter(param) for param in node]
 
-        def parse_parameter(param_node: ET._Element) -> Any:
-            value = param_node.find("value")
-            value_node = value[0]
-
-            def _parse_value(value_node: ET._Element) -> Any:
-                if value_node.tag == "value":
-                    return _parse_value(value_node[0])
-                elif value_node.tag == "int" or value_node.tag == "i4":
-                    return int(value_node.text)
-                elif value_node.tag == "boolean":
-                    return int(value_node.text) == 1
-                elif value_node.tag == "double":
-                    return float(value_node.text)
-                elif value_node.tag == "base64":
-                    return base64.b64decode(value_node.text)
-                elif value_node.tag == "dateTime.iso8601":
-                    return datetime.datetime.strptime(
-                        "%Y%m%dT%H:%M:%S", value_node.text
-                    )
-                elif value_node.tag == "string":
-                    return value_node.text
-                elif value_node.tag == "array":
-                    return [_parse_value(n) for n in value_node[0] if n.tag == "value"]
-                elif value_node.tag == "struct":
-                    return dict(
-                        [
-                            (member.find("name").text, parse_parameter(member))
-                            for member in value_node
-                        ]
-                    )
-                raise BadRequestError(
-                    "Unknown value type '{0}'.".format(value_node.tag)
-                )
+    @staticmethod
+    def parse_parameter(node: ET._Element) -> Any:
+        """
+        Parses the <value/> child of a <param/> or <member/> node.
 
-            return _parse_value(value_node)
+        :param node lxml.etree._Element: The <param/> or <member/> node.
+        :returns object: The parsed value.
+        :raises fruition.api.exceptions.BadRequestError: When the type of the value is incorrect.
+        """
+        return XMLRPCServer.parse_value(node.find("value")[0])
 
-        return [parse_parameter(param) for param in node]
+    @staticmethod
+    def parse_struct(node: ET._Element) -> dict:
+        """
+        Parses a <struct/> node, walking the children of each <member/> only once.
+
+        >>> from lxml.builder import E
+        >>> from fruition.api.server.webservice.rpc.xmlrpc import XMLRPCServer
+        >>> XMLRPCServer.parse_struct(E.struct(E.member(E.name("foo"), E.value(E.int("1")))))
+        {'foo': 1}
+
+        :param node lxml.etree._Element: The <struct/> node.
+        :returns dict: The parsed members.
+        :raises fruition.api.exceptions.BadRequestError: When a member is missing its name or value.
+        """
+        parse_value = XMLRPCServer.parse_value
+        struct = {}
+        for member in node:
+            name = value = None
+            for child in member:
+                if child.tag == "name":
+                    name = child
+                elif child.tag == "value":
+                    value = child
+            if name is None or value is None:
+                raise BadRequestError("Struct members must have a name and a value.")
+            struct[name.text] = parse_value(value[0])
+        return struct
 
-    def format_response(self, result: Any, request: Request, response: Response) -> str:
+    @staticmethod
+    def parse_value(
+        node: ET._Element,
+        _get_parser: Callable[
+            [str], Optional[Callable[[ET._Element], Any]]
+        ] = VALUE_PARSERS.get,
+        /,
+    ) -> Any:
+        """
+        Parses a typed value node, i.e. <int/> or <struct/>, by looking its tag up in ``VALUE_PARSERS``.
+
+        The lookup is bound once as a default argument, as this is called for every value in a request.
+
+        >>> from lxml.builder import E
+        >>> from fruition.api.server.webservice.rpc.xmlrpc import XMLRPCServer
+        >>> XMLRPCServer.parse_value(E.double("2.5"))
+        2.5
+        >>> XMLRPCServer.parse_value(E.boolean("true"))
+        True
+
+        :param node lxml.etree._Element: The typed value node.
+        :returns object: The parsed value.
+        :raises fruition.api.exceptions.BadRequestError: When the type of the value is unknown.
+        """
+        parser = _get_parser(node.tag)
+        if parser is None:
+            raise BadRequestError("Unknown value type '{0}'.".format(node.tag))
+        return parser(node)
+
+    def format_response(
+        self, result: Any, request: Request, response: Response
+    ) -> bytes:
         """
         Formats a method response from the dispatcher.
 
+        The document is written directly as a string rather than built as an element tree.
+
         :param response object: The response from the method.
-        :returns str: The <methodResponse/> node.
+        :returns bytes: The <methodResponse/> node.
         """
         if result is None:
-            return decode(ET.tostring(E.methodResponse(E.params())))
-        return decode(
-            ET.tostring(E.methodResponse(XMLRPCServer.format_parameters(result)))
-        )
+            return XMLRPC_EMPTY_RESPONSE
+        return XMLRPC_RESPONSE_TEMPLATE.format(
+            XMLRPCServer.format_value_string(result)
+        ).encode("utf-8")
 
     def format_exception(
         self, exception: Exception, request: Request, response: Response
@@ -264,17 +534,13 @@ class XMLRPCServer(RPCServerBase):
         :param ex exception: The exception thrown.
         :return str: The <fault/> node.
         """
-        code = -32500
-        if isinstance(exception, ET.XMLSyntaxError):
-            code = -32700
-        if isinstance(exception, UnsupportedMethodError):
-            code = -32601
-        if isinstance(exception, BadRequestError):
-            code = -32600
+        code = next(
+            (c for t, c in self.ERROR_CODES if isinstance(exception, t)), -32500
+        )
         return decode(
             ET.tostring(
-                E.methodResponse(
-                    E.fault(
+                E_METHOD_RESPONSE(
+                    E_FAULT(
                         XMLRPCServer.format_parameter(
                             {"faultCode": code, "faultString": str(exception)}
                         )[0]
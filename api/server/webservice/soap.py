@@ -1,9 +1,24 @@
+import gzip
+import hashlib
 import datetime
+import platform
 
 from lxml import etree as ET
 from lxml.builder import ElementMaker
 
-from typing import Type, Optional, Any, Iterator, Tuple, List, Dict, cast
+from types import MappingProxyType
+from typing import (
+    Type,
+    Optional,
+    Any,
+    Iterator,
+    Tuple,
+    List,
+    Dict,
+    Callable,
+    Mapping,
+    cast,
+)
 
 from webob import Request, Response
 
@@ -15,9 +30,60 @@ from fruition.api.exceptions import (
     ConfigurationError,
     NotFoundError,
 )
-from fruition.util.strings import decode, encode, Serializer
+from fruition.util.strings import Serializer
 from fruition.util.log import logger
 
+# Shared by all requests; lxml reads the encoding from the body itself.
+SOAP_PARSER = ET.XMLParser(resolve_entities=False)
+
+# Outside of CPython (i.e. PyPy), crossing into lxml costs more than the standard
+# library parser does, so requests are read with that instead. Documents are still
+# built with lxml.
+USE_LXML_PARSER = platform.python_implementation() == "CPython"
+
+if USE_LXML_PARSER:
+
+    def parse_envelope(body: bytes) -> Any:
+        """
+        Parses a request body into an element tree.
+
+        >>> parse_envelope(b"<Envelope><Body/></Envelope>")[0].tag
+        'Body'
+
+        :raises SyntaxError: When the body is not well-formed.
+        """
+        return ET.fromstring(body, SOAP_PARSER)
+
+else:
+    from xml.etree import ElementTree as StdlibET
+
+    def parse_envelope(body: bytes) -> Any:
+        """
+        Parses a request body into an element tree.
+
+        >>> parse_envelope(b"<Envelope><Body/></Envelope>")[0].tag
+        'Body'
+
+        :raises SyntaxError: When the body is not well-formed.
+        """
+        return StdlibET.fromstring(body)
+
+REQUEST_SUFFIX_LENGTH = -len("Request")
+LIST_INDEX_LENGTH = len("listIndex")
+MISSING_ARGUMENT = object()
+DOCUMENT_COMPRESSION_LEVEL = 6
+
+XSD_TYPES: Mapping[Type, str] = MappingProxyType(
+    {
+        int: "xsd:int",
+        float: "xsd:decimal",
+        datetime.datetime: "xsd:datetime",
+        bool: "xsd:boolean",
+        bytes: "xsd:base64Binary",
+        str: "xsd:string",
+    }
+)
+
 
 class MultiNamespaceElementBuilder:
     """
@@ -28,11 +94,16 @@ class MultiNamespaceElementBuilder:
 
     def __init__(self, **nsmap: str):
         self.namespaces = dict(nsmap)
+        for ns in self.namespaces:
+            setattr(
+                self,
+                ns,
+                ElementMaker(namespace=self.namespaces[ns], nsmap=self.namespaces),
+            )
 
     def __getattr__(self, ns: str) -> ElementMaker:
-        if ns not in self.namespaces:
-            raise KeyError(f"Unknown namespace {ns}")
-        return ElementMaker(namespace=self.namespaces[ns], nsmap=self.namespaces)
+        # Only reached for namespaces that weren't created in __init__.
+        raise KeyError(f"Unknown namespace {ns}")
 
 
 class SOAPServer(MethodBasedWebServiceAPIServerBase):
@@ -56,19 +127,130 @@ class SOAPServer(MethodBasedWebServiceAPIServerBase):
 
     handlers = WebServiceAPIHandlerRegistry()
 
+    documents: Dict[str, Tuple[bytes, bytes, str]]
+    coercers: Dict[
+        str, Tuple[List[Callable[[Any], Any]], Dict[str, Callable[[Any], Any]]]
+    ]
+    service_namespaces: Optional[Tuple[str, str, str]]
+    response_builder: Optional[MultiNamespaceElementBuilder]
+
+    def __init__(self) -> None:
+        super(SOAPServer, self).__init__()
+        self.documents = {}
+        self.coercers = {}
+        self.service_namespaces = None
+        self.response_builder = None
+
+    def on_configure(self) -> None:
+        """
+        The documents and namespaces embed the configured location, so drop any generated ones.
+        """
+        self.documents = {}
+        self.service_namespaces = None
+        self.response_builder = None
+
+    def get_service_namespaces(self) -> Tuple[str, str, str]:
+        """
+        Gets the base location of the service and the namespaces of its WSDL and XSD
+        documents, computed once per configuration.
+
+        :returns tuple: A three-tuple of (location, WSDL namespace, XSD namespace).
+        """
+        if self.service_namespaces is None:
+            ssl = self.configuration.get("server.secure", False)
+            hostname = self.configuration.get("server.hostname", "127.0.0.1")
+            name = self.configuration.get("server.name", "SOAPServer")
+            protocol = "https" if ssl else "http"
+            port = self.configuration["server.port"]
+            base_path = self.configuration.get("server.path", "/")
+            path = f"{protocol}://{hostname}:{port}{base_path}"
+            self.service_namespaces = (path, f"{path}{name}.wsdl", f"{path}{name}.xsd")
+        return self.service_namespaces
+
+    def get_response_builder(self) -> MultiNamespaceElementBuilder:
+        """
+        Gets the element builder for response envelopes, created once per configuration.
+        """
+        if self.response_builder is None:
+            _, xmlns, xmlnsxsd = self.get_service_namespaces()
+            self.response_builder = MultiNamespaceElementBuilder(
+                soapenv="http://schemas.xmlsoap.org/soap/envelope/",
+                tns=xmlns,
+                xsd1=xmlnsxsd,
+            )
+        return self.response_builder
+
+    def methods_changed(self) -> None:
+        """
+        The documents and coercers describe registered methods, so drop any generated ones.
+        """
+        super(SOAPServer, self).methods_changed()
+        self.documents = {}
+        self.coercers = {}
+
+    @staticmethod
+    def get_coercer(signed: Any) -> Callable[[Any], Any]:
+        """
+        Gets the function that turns the text of an argument into its value.
+
+        Strings, whether signed by type or by a default value, are passed through;
+        everything else is deserialized.
+
+        >>> from fruition.api.server.webservice.soap import SOAPServer
+        >>> SOAPServer.get_coercer(str)("007")
+        '007'
+        >>> SOAPServer.get_coercer(int)("007")
+        7
+
+        :param signed object: The type or default value from the signature.
+        :returns Callable: The coercion function.
+        """
+        if signed is str or isinstance(signed, str):
+            return lambda value: value
+        return Serializer.deserialize
+
+    def get_method_coercers(
+        self, fn: MethodBasedWebServiceAPIServerBase.WebServiceMethod
+    ) -> Tuple[List[Callable[[Any], Any]], Dict[str, Callable[[Any], Any]]]:
+        """
+        Gets the positional and named argument coercers of a method, built once per method.
+
+        :param fn WebServiceMethod: The method.
+        :returns tuple: A two-tuple of (list, dict) of coercion functions.
+        """
+        coercers = self.coercers.get(fn.name, None)
+        if coercers is None:
+            coercers = (
+                [self.get_coercer(signed) for signed in fn.signature[0]]
+                if fn.signature
+                else [],
+                {
+                    key: self.get_coercer(fn.named_signature[key])
+                    for key in fn.named_signature
+                }
+                if fn.named_signature
+                else {},
+            )
+            self.coercers[fn.name] = coercers
+        return coercers
+
     @staticmethod
     def get_type(obj: Type) -> str:
         """
         Takes a python type and turns it into the xsd equivalent.
+
+        >>> from fruition.api.server.webservice.soap import SOAPServer
+        >>> SOAPServer.get_type(int)
+        'xsd:int'
+
+        :param obj type: The python type.
+        :returns str: The XSD type name.
+        :raises KeyError: When the type has no XSD equivalent.
         """
-        return {
-            int: "xsd:int",
-            float: "xsd:decimal",
-            datetime.datetime: "xsd:datetime",
-            bool: "xsd:boolean",
-            bytes: "xsd:base64Binary",
-            str: "xsd:string",
-        }[obj]
+        try:
+            return XSD_TYPES[obj]
+        except KeyError:
+            raise KeyError(f"Type {obj!r} has no XSD equivalent.")
 
     def _generate_xsd(self) -> ET._Element:
         """
@@ -76,17 +258,7 @@ class SOAPServer(MethodBasedWebServiceAPIServerBase):
         types for registered methods.
         """
 
-        ssl = self.configuration.get("server.secure", False)
-        hostname = self.configuration.get("server.hostname", "127.0.0.1")
-        name = self.configuration.get("server.name", "SOAPServer")
-        path = "{protocol}://{hostname}:{port}{path}".format(
-            protocol="https" if ssl else "http",
-            hostname=hostname,
-            path=self.configuration.get("server.path", "/"),
-            port=self.configuration["server.port"],
-        )
-
-        xmlnsxsd = "{0}{1}.xsd".format(path, name)
+        _, _, xmlnsxsd = self.get_service_namespaces()
 
         nsmap = {"xsd": "http://www.w3.org/2001/XMLSchema"}
 
@@ -96,7 +268,7 @@ class SOAPServer(MethodBasedWebServiceAPIServerBase):
             def _list_node(name: str, lst: List[Type]) -> Iterator[ET._Element]:
                 for node in _dict_node(
                     name,
-                    dict(zip(["listIndex{0}".format(i) for i in range(len(lst))], lst)),
+                    dict(zip([f"listIndex{i}" for i in range(len(lst))], lst)),
                 ):
                     yield node
 
@@ -171,18 +343,8 @@ class SOAPServer(MethodBasedWebServiceAPIServerBase):
         This generates the WSDL document describing all registered methods.
         """
 
-        ssl = self.configuration.get("server.secure", False)
-        hostname = self.configuration.get("server.hostname", "127.0.0.1")
         name = self.configuration.get("server.name", "SOAPServer")
-        path = "{protocol}://{hostname}:{port}{path}".format(
-            protocol="https" if ssl else "http",
-            hostname=hostname,
-            path=self.configuration.get("server.path", "/"),
-            port=self.configuration["server.port"],
-        )
-
-        xmlns = "{0}{1}.wsdl".format(path, name)
-        xmlnsxsd = "{0}{1}.xsd".format(path, name)
+        path, xmlns, xmlnsxsd = self.get_service_namespaces()
         http_tp = "http://schemas.xmlsoap.org/soap/http"
 
         nsmap = {
@@ -197,96 +359,81 @@ class SOAPServer(MethodBasedWebServiceAPIServerBase):
 
         E = MultiNamespaceElementBuilder(**nsmap)
 
-        def _get_messages() -> ET._Element:
-            for method in self.methods:
-                for typename in ["Request", "Response"]:
-                    yield E.wsdl.message(
+        messages = []
+        port_operations = []
+        soap11_operations = []
+        soap12_operations = []
+        for method in self.methods:
+            for typename in ["Request", "Response"]:
+                messages.append(
+                    E.wsdl.message(
                         E.wsdl.part(
                             name="body",
-                            element="xsd1:{0}{1}".format(method.name, typename),
+                            element=f"xsd1:{method.name}{typename}",
                         ),
-                        name="{0}{1}".format(method.name, typename),
+                        name=f"{method.name}{typename}",
                     )
+                )
+            port_operations.append(
+                E.wsdl.operation(
+                    E.wsdl.input(message=f"tns:{method.name}Request"),
+                    E.wsdl.output(message=f"tns:{method.name}Response"),
+                    name=method.name,
+                )
+            )
+            soap_action = f"urn:{method.name}"
+            soap11_operations.append(
+                E.wsdl.operation(
+                    E.soap.operation(soapAction=soap_action, style="document"),
+                    E.wsdl.input(E.soap.body(use="literal", namespace=xmlns)),
+                    E.wsdl.output(E.soap.body(use="literal", namespace=xmlns)),
+                    name=method.name,
+                )
+            )
+            soap12_operations.append(
+                E.wsdl.operation(
+                    E.soap12.operation(soapAction=soap_action, style="document"),
+                    E.wsdl.input(E.soap12.body(use="literal")),
+                    E.wsdl.output(E.soap12.body(use="literal")),
+                    name=method.name,
+                )
+            )
 
         return E.wsdl.definitions(
             E.wsdl.documentation(
                 self.configuration.get(
-                    "server.documentation", "WSDL File for {0}Service".format(name)
+                    "server.documentation", f"WSDL File for {name}Service"
                 )
             ),
             E.wsdl.types(self._generate_xsd()),
-            *[message for message in _get_messages()]
-            + [
-                E.wsdl.portType(
-                    *[
-                        E.wsdl.operation(
-                            E.wsdl.input(message="tns:{0}Request".format(method.name)),
-                            E.wsdl.output(
-                                message="tns:{0}Response".format(method.name)
-                            ),
-                            name=method.name,
-                        )
-                        for method in self.methods
-                    ],
-                    **{"name": "{0}PortType".format(name)},
-                ),
-                E.wsdl.binding(
-                    E.soap.binding(transport=http_tp, style="document"),
-                    *[
-                        E.wsdl.operation(
-                            E.soap.operation(
-                                soapAction="urn:{0}".format(method.name),
-                                style="document",
-                            ),
-                            E.wsdl.input(E.soap.body(use="literal", namespace=xmlns)),
-                            E.wsdl.output(E.soap.body(use="literal", namespace=xmlns)),
-                            name=method.name,
-                        )
-                        for method in self.methods
-                    ],
-                    **{
-                        "name": "{0}Soap11Binding".format(name),
-                        "type": "tns:{0}PortType".format(name),
-                    },
-                ),
-                E.wsdl.binding(
-                    E.soap12.binding(transport=http_tp, style="document"),
-                    *[
-                        E.wsdl.operation(
-                            E.soap12.operation(
-                                soapAction="urn:{0}".format(method.name),
-                                style="document",
-                            ),
-                            E.wsdl.input(E.soap12.body(use="literal")),
-                            E.wsdl.output(E.soap12.body(use="literal")),
-                            name=method.name,
-                        )
-                        for method in self.methods
-                    ],
-                    **{
-                        "name": "{0}Soap12Binding".format(name),
-                        "type": "tns:{0}PortType".format(name),
-                    },
+            *messages,
+            E.wsdl.portType(*port_operations, name=f"{name}PortType"),
+            E.wsdl.binding(
+                E.soap.binding(transport=http_tp, style="document"),
+                *soap11_operations,
+                name=f"{name}Soap11Binding",
+                type=f"tns:{name}PortType",
+            ),
+            E.wsdl.binding(
+                E.soap12.binding(transport=http_tp, style="document"),
+                *soap12_operations,
+                name=f"{name}Soap12Binding",
+                type=f"tns:{name}PortType",
+            ),
+            E.wsdl.service(
+                E.wsdl.port(
+                    E.soap.address(location=f"{path}services/{name}Soap11Endpoint"),
+                    binding=f"tns:{name}Soap11Binding",
+                    name=f"{name}Soap11Port",
                 ),
-                E.wsdl.service(
-                    E.wsdl.port(
-                        E.soap.address(
-                            location="{0}services/{1}Soap11Endpoint".format(path, name)
-                        ),
-                        binding="tns:{0}Soap11Binding".format(name),
-                        name="{0}Soap11Port".format(name),
-                    ),
-                    E.wsdl.port(
-                        E.soap12.address(
-                            location="{0}services/{1}Soap12Endpoint".format(path, name)
-                        ),
-                        binding="tns:{0}Soap12Binding".format(name),
-                        name="{0}Soap12Port".format(name),
-                    ),
-                    name="{0}Service".format(name),
+                E.wsdl.port(
+                    E.soap12.address(location=f"{path}services/{name}Soap12Endpoint"),
+                    binding=f"tns:{name}Soap12Binding",
+                    name=f"{name}Soap12Port",
                 ),
-            ],
-            **{"targetNamespace": xmlns},
+                name=f"{name}Service",
+            ),
+            targetNamespace=xmlns,
         )
 
     def parse_method_call(
@@ -297,126 +444,157 @@ class SOAPServer(MethodBasedWebServiceAPIServerBase):
         method, arguments, and keyword arguments.
         """
         try:
-            envelope = ET.fromstring(encode(request.text))
-        except ET.XMLSyntaxError:
+            envelope = parse_envelope(request.body)
+        except SyntaxError:
             logger.error(f"Couldn't parse SOAP envelope {request.text}")
             raise
 
         body = envelope.find("{http://schemas.xmlsoap.org/soap/envelope/}Body")
 
         method_node = body[0]
-        method_request = method_node.tag.split("}")[1]
-        method = method_request[: -1 * len("Request")]
+        method = method_node.tag.rpartition("}")[2][:REQUEST_SUFFIX_LENGTH]
+
+        fn = self._find_method_by_name(method)
+        if not fn or not fn.registered:
+            raise UnsupportedMethodError(f"{method} does not exist.")
+        setattr(request, "soap_fn", fn)
 
-        argsdict = {}
+        positional, named = self.get_method_coercers(fn)
+        args: List[Any] = [MISSING_ARGUMENT] * len(positional)
         kwargs = {}
         for child in method_node:
-            if child.tag.split("}")[1].startswith("listIndex"):
-                index = int(child.tag.split("}")[1][len("listIndex") :])
-                argsdict[index] = child.text
+            local_name = child.tag.rpartition("}")[2]
+            if local_name.startswith("listIndex"):
+                suffix = local_name[LIST_INDEX_LENGTH:]
+                if not suffix.isdecimal():
+                    raise BadRequestError(
+                        f"Method {method} has no argument {local_name}, "
+                        "positional arguments are named listIndex0, listIndex1, etc."
+                    )
+                index = int(suffix)
+                if index >= len(args):
+                    raise BadRequestError(
+                        f"Method {method} takes {len(args)} argument(s), "
+                        f"has no {local_name}."
+                    )
+                args[index] = positional[index](child.text)
             else:
-                kwargs[child.tag.split("}")[1]] = child.text
-        args = list(argsdict.values())
-        fn = self._find_method_by_name(method)
-        if not fn or not fn.registered:
-            raise UnsupportedMethodError("{0} does not exist.".format(method))
-
-        if fn.signature:
-            for i, arg in enumerate(args):
-                if (
-                    type(fn.signature[0][i]) is type and fn.signature[0][i] is not str
-                ) or not isinstance(fn.signature[0][i], str):
-                    args[i] = Serializer.deserialize(arg)
-        elif fn.named_signature:
+                kwargs[local_name] = child.text
+
+        # Trailing arguments may be left off, leaving the method's defaults.
+        while args and args[-1] is MISSING_ARGUMENT:
+            args.pop()
+        for index, arg in enumerate(args):
+            if arg is MISSING_ARGUMENT:
+                raise BadRequestError(
+                    f"Method {method} is missing argument listIndex{index}."
+                )
+
+        if not fn.signature and fn.named_signature:
             for key in kwargs:
-                if key not in fn.named_signature:
+                coerce = named.get(key, None)
+                if coerce is None:
                     raise BadRequestError(
-                        "Method {0} does not understand keyword argument {1}.".format(
-                            method, key
-                        )
+                        f"Method {method} does not understand keyword argument {key}."
                     )
-                if (
-                    type(fn.named_signature[key]) is type
-                    and fn.named_signature[key] is not str
-                ) or not isinstance(fn.named_signature[key], str):
-                    kwargs[key] = Serializer.deserialize(kwargs[key])
+                kwargs[key] = coerce(kwargs[key])
 
         return method, args, kwargs
 
-    def format_response(self, result: Any, request: Request, response: Response) -> str:
+    def format_response(
+        self, result: Any, request: Request, response: Response
+    ) -> bytes:
         """
         Takes a result and formats it in the appropriate XSD object
         as generated during initial request.
         """
-        method = request.soap_method
-        fn = self._find_method_by_name(method)
-        if not fn or not fn.registered:
-            raise UnsupportedMethodError("{0} does not exist.".format(method))
-        ssl = self.configuration.get("server.secure", False)
-        name = self.configuration.get("server.name", "SOAPServer")
-        hostname = self.configuration.get("server.hostname", "127.0.0.1")
-        path = "{protocol}://{hostname}:{port}{path}".format(
-            protocol="https" if ssl else "http",
-            hostname=hostname,
-            path=self.configuration.get("server.path", "/"),
-            port=self.configuration["server.port"],
+        fn = getattr(request, "soap_fn", None)
+        if fn is None:
+            method = request.soap_method
+            fn = self._find_method_by_name(method)
+            if not fn or not fn.registered:
+                raise UnsupportedMethodError(f"{method} does not exist.")
+        E = self.get_response_builder()
+        return cast(
+            bytes,
+            ET.tostring(
+                E.soapenv.Envelope(E.soapenv.Body(self.format_result(fn, result)))
+            ),
         )
 
-        xmlns = "{0}{1}.wsdl".format(path, name)
-        xmlnsxsd = "{0}{1}.xsd".format(path, name)
-
-        nsmap = {
-            "soapenv": "http://schemas.xmlsoap.org/soap/envelope/",
-            "tns": xmlns,
-            "xsd1": xmlnsxsd,
-        }
-
-        E = MultiNamespaceElementBuilder(**nsmap)
-
-        def _get_node(method: str, result: Any) -> ET._Element:
-            if fn.response_signature:  # type: ignore
-                if fn.response_signature is not list:  # type: ignore
-                    result = [result]
-                return E.xsd1(
-                    "{0}Response".format(method),
-                    *[
-                        E.xsd1("listIndex{0}".format(i), str(part))
-                        for i, part in enumerate(result)
-                    ],
-                )
-            elif fn.response_named_signature:  # type: ignore
-                return E.xsd1(
-                    "{0}Response".format(method),
-                    *[E.xsd1(key, str(result[key])) for key in result],
-                )
+    def format_result(
+        self, fn: MethodBasedWebServiceAPIServerBase.WebServiceMethod, result: Any
+    ) -> ET._Element:
+        """
+        Formats the result of a method into its <{method}Response/> node.
 
-        return cast(
-            str,
-            ET.tostring(E.soapenv.Envelope(E.soapenv.Body(_get_node(method, result)))),
+        :param fn WebServiceMethod: The method that was called.
+        :param result object: The result of the method.
+        :returns lxml.etree._Element: The response node.
+        :raises fruition.api.exceptions.ConfigurationError: When the response isn't signed.
+        """
+        xsd1 = self.get_response_builder().xsd1
+        if fn.response_signature:
+            if fn.response_signature is not list:
+                result = [result]
+            return xsd1(
+                f"{fn.name}Response",
+                *[xsd1(f"listIndex{i}", str(part)) for i, part in enumerate(result)],
+            )
+        elif fn.response_named_signature:
+            return xsd1(
+                f"{fn.name}Response",
+                *[xsd1(key, str(result[key])) for key in result],
+            )
+        raise ConfigurationError(
+            "Cannot have non-signed methods when using a SOAP server."
         )
 
     @handlers.path(r"/(?P<service_name>\w*)\.(?P<request_type>\w*)")
     @handlers.methods("GET")
     def wsdl(
         self, request: Request, response: Response, service_name: str, request_type: str
-    ) -> str:
+    ) -> bytes:
         """
         This handles the request for WSDL or XSD documents. This is the
         entry point for most clients.
+
+        Documents are generated once and kept, along with a gzipped copy and an
+        ETag, until the configuration or the registered methods change.
         """
         name = self.configuration.get("server.name", "SOAPServer")
         if service_name == name:
-            if request_type == "wsdl":
-                return decode(ET.tostring(self._generate_wsdl()))
-            if request_type == "xsd":
-                return decode(ET.tostring(self._generate_xsd()))
+            document = self.documents.get(request_type, None)
+            if document is None:
+                if request_type == "wsdl":
+                    body = ET.tostring(self._generate_wsdl())
+                elif request_type == "xsd":
+                    body = ET.tostring(self._generate_xsd())
+                else:
+                    raise NotFoundError(f"Unknown document type {request_type}")
+                document = (
+                    body,
+                    gzip.compress(body, compresslevel=DOCUMENT_COMPRESSION_LEVEL),
+                    hashlib.sha1(body).hexdigest(),
+                )
+                self.documents[request_type] = document
+            body, compressed, etag = document
+            response.etag = etag
+            response.headers["Vary"] = "Accept-Encoding"
+            if etag in request.if_none_match:
+                response.status_code = 304
+                return b""
+            if "gzip" in request.headers.get("Accept-Encoding", ""):
+                response.headers["Content-Encoding"] = "gzip"
+                return compressed
+            return body
         raise NotFoundError(f"Unknown service {service_name}")
 
     @handlers.path(r"/services/(?P<service_name>\w*)")
     @handlers.methods("POST")
     def method_call(
         self, request: Request, response: Response, service_name: str
-    ) -> str:
+    ) -> bytes:
         """
         This will handle method calls of all registered methods.
         """
@@ -427,6 +605,4 @@ class SOAPServer(MethodBasedWebServiceAPIServerBase):
             method, *(args if args else []), **(kwargs if kwargs else {})
         )
         response.headers["Content-Type"] = "application/soap+xml"
-        return decode(
-            self.format_response(result=result, request=request, response=response)
-        )
+        return self.format_response(result=result, request=request, response=response)
@@ -1,10 +1,23 @@
 from __future__ import annotations
 
 import io
+import gzip
 import logging
+import functools
 import traceback
 
-from typing import Optional, Callable, Any, List
+from typing import (
+    Optional,
+    Callable,
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Type,
+    Iterable,
+    Iterator,
+    FrozenSet,
+)
 from webob import Request, Response
 
 from fruition.util.helpers import CompressedIterator
@@ -19,6 +32,21 @@ from fruition.api.server.webservice.handler import (
 )
 from fruition.api.server.webservice.template.loader import TemplateLoader
 
+# Error bodies under this size are compressed in one call rather than streamed.
+ERROR_BODY_COMPRESS_MAX_LENGTH = 65536
+
+
+@functools.lru_cache(maxsize=64)
+def compress_error_body(body: bytes) -> bytes:
+    """
+    Gzips a small error body. Error pages tend to repeat, so recent results are kept.
+
+    >>> import gzip
+    >>> gzip.decompress(compress_error_body(b"Not Found"))
+    b'Not Found'
+    """
+    return gzip.compress(body, compresslevel=1)
+
 
 class TemplateHandler(WebServiceAPIHandler):
     """
@@ -29,12 +57,14 @@ class TemplateHandler(WebServiceAPIHandler):
         self,
         function: Callable,
         template: Optional[str] = None,
-        errors: Optional[List[int]] = [],
+        errors: Optional[Iterable[int]] = None,
+        stream_template: bool = False,
         **kwargs: Any,
     ):
         super(TemplateHandler, self).__init__(function, **kwargs)
         self.template = template
-        self.errors = errors
+        self.errors: FrozenSet[int] = frozenset(errors or ())
+        self.stream_template = stream_template
 
     def __call__(
         self,
@@ -60,11 +90,26 @@ class TemplateHandler(WebServiceAPIHandler):
                 raise ConfigurationError(
                     "Template handler did not return a context dictionary."
                 )
+            request_context = getattr(request, "context", None)
+            if request_context:
+                context = {**request_context, **context}
             try:
+                if self.stream_template:
+                    logger.debug(f"Streaming template {self.template}")
+                    # The template is found now, so a missing template is raised here
+                    chunks = self.encode_stream(
+                        server.templates.stream(self.template, **context)
+                    )
+                    if self.compress_response and "gzip" in request.headers.get(
+                        "Accept-Encoding", ""
+                    ):
+                        response.app_iter = CompressedIterator(chunks)
+                        response.headers["Content-Encoding"] = "gzip"
+                    else:
+                        response.app_iter = chunks
+                    return None
                 logger.debug(f"Rendering template {self.template}")
-                rendered = server.templates.render(
-                    self.template, **{**getattr(request, "context", {}), **context}
-                )
+                rendered = server.templates.render(self.template, **context)
                 if not rendered:
                     logger.warn("Template rendered empty.")
                 return rendered
@@ -76,6 +121,22 @@ class TemplateHandler(WebServiceAPIHandler):
                 server, request, response, *args, **kwargs
             )
 
+    def encode_stream(self, stream: Iterable[str]) -> Iterator[bytes]:
+        """
+        Encodes a template stream. Errors raised while iterating happen after the
+        response has started, where the server can no longer send an error page, so
+        they are logged here before being raised to the WSGI server.
+        """
+        try:
+            for chunk in stream:
+                yield chunk.encode("utf-8")
+        except:
+            logger.critical(
+                "Exception during template streaming, the response is incomplete."
+            )
+            logger.error(traceback.format_exc())
+            raise
+
     def __repr__(self) -> str:
         return "{0} (template: {1}, errors: {2})".format(
             super(TemplateHandler, self).__repr__(), self.template, self.errors
@@ -83,7 +144,9 @@ class TemplateHandler(WebServiceAPIHandler):
 
 
 class TemplateServerHandlerRegistry(WebServiceAPIHandlerRegistry):
-    def template(self, filename: str) -> Callable[[Callable], Callable]:
+    def template(
+        self, filename: str, stream: bool = False
+    ) -> Callable[[Callable], Callable]:
         """
         Registers a template handler.
 
@@ -93,10 +156,16 @@ class TemplateServerHandlerRegistry(WebServiceAPIHandlerRegistry):
         - When a template is not found, it is considered a configuration error.
         - Templates use Jinja2 to render.
         - Templates are **always** given a variable of `csrf_token`. They can be ignored if so desired.
+        - When `stream` is true, the template is written to the response as it renders instead of all at once. This keeps memory down for large pages, but rendering errors can no longer change the status of the response.
+
+        :param filename str: The template to render.
+        :param stream bool: Whether to stream the rendered template.
         """
 
         def wrap(fn: Callable) -> Callable:
-            self.create_or_modify_handler(fn, template=filename)
+            self.create_or_modify_handler(
+                fn, template=filename, stream_template=stream
+            )
             return fn
 
         return wrap
@@ -112,7 +181,9 @@ class TemplateServerHandlerRegistry(WebServiceAPIHandlerRegistry):
         """
 
         def wrap(fn: Callable) -> Callable:
-            self.create_or_modify_handler(fn, errors=[int(code) for code in codes])
+            self.create_or_modify_handler(
+                fn, errors=frozenset([int(code) for code in codes])
+            )
             return fn
 
         return wrap
@@ -134,16 +205,26 @@ class TemplateServer(WebServiceAPIServerBase):
     """
 
     class_handlers: List[WebServiceAPIHandlerRegistry]
+    error_handlers: Dict[int, WebServiceAPIHandler]
+
+    def __init__(self) -> None:
+        super(TemplateServer, self).__init__()
+        self.error_handlers = {}
 
     def on_configure(self) -> None:
         """
-        Create the template loader.
+        Create the template loader, and index error handlers by the status codes they handle.
 
         This does not require any actual configuration, but see :class:fruition.api.server.webservice.html.server.TemplateServerTemplateLoader for optional keys.
         """
         if not hasattr(self, "templates"):
             logger.debug("Creating template loader.")
             self.templates = TemplateLoader(self.configuration, server=self)
+        self.error_handlers = {}
+        for registry in self.class_handlers:
+            for handler in registry.handlers:
+                for code in getattr(handler, "errors", ()):
+                    self.error_handlers.setdefault(code, handler)
 
     def prepare_context_all(self, request: Request, response: Response) -> None:
         """
@@ -151,28 +232,47 @@ class TemplateServer(WebServiceAPIServerBase):
         """
 
         handler = getattr(request, "handler", None)
+        preparers = self.get_context_preparers()
+        if handler is not None and handler.bypass:
+            preparers = tuple([cls for cls in preparers if cls not in handler.bypass])
+        if not preparers:
+            return
         if not hasattr(request, "context"):
             setattr(request, "context", {})
-        for cls in reversed(type(self).mro()):
-            if hasattr(cls, "prepare_context") and "prepare_context" in cls.__dict__:
-                if handler is None or (
-                    handler is not None and cls not in handler.bypass
-                ):
-                    logger.debug(
-                        "Running context preparation for class {0}".format(cls.__name__)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for cls in preparers:
+            if debug:
+                logger.debug(
+                    "Running context preparation for class {0}".format(cls.__name__)
+                )
+            try:
+                request.context.update(cls.prepare_context(self, request, response))
+            except Exception as ex:
+                logger.error(
+                    "Could not execute context preparation for class '{0}' - {1}: {2}".format(
+                        cls.__name__, type(ex).__name__, ex
                     )
-                    try:
-                        request.context = {
-                            **request.context,
-                            **cls.prepare_context(self, request, response),
-                        }
-                    except Exception as ex:
-                        logger.error(
-                            "Could not execute context preparation for class '{0}' - {1}: {2}".format(
-                                cls.__name__, type(ex).__name__, ex
-                            )
-                        )
-                        pass
+                )
+                pass
+
+    @classmethod
+    def get_context_preparers(cls) -> Tuple[Type, ...]:
+        """
+        Gets the classes in the MRO that define ``prepare_context()``, in the order
+        they should run. The MRO of a class doesn't change, so this is resolved once
+        per class.
+        """
+        preparers = cls.__dict__.get("_context_preparers", None)
+        if preparers is None:
+            preparers = tuple(
+                [
+                    mro_cls
+                    for mro_cls in reversed(cls.mro())
+                    if "prepare_context" in mro_cls.__dict__
+                ]
+            )
+            setattr(cls, "_context_preparers", preparers)
+        return preparers
 
     def prepare_context(self, request: Request, response: Response) -> dict:
         """
@@ -192,49 +292,46 @@ class TemplateServer(WebServiceAPIServerBase):
                     response.status_code
                 )
             )
-            for registry in self.class_handlers:
-                for handler in registry.handlers:
-                    if response.status_code in getattr(handler, "errors", []):
-                        logger.debug("Found error handler {0}".format(handler))
-                        try:
-                            result = handler(self, request, response)
-                            accepted_encodings = ""
-                            if request is not None:
-                                accepted_encodings = request.headers.get(
-                                    "Accept-Encoding", ""
-                                )
-                            if (
-                                handler.compress_response
-                                and "gzip" in accepted_encodings
-                                and result
-                            ):
-                                if logger.isEnabledFor(logging.DEBUG):
-                                    logger.debug(
-                                        "Error handler compressing result {0}".format(
-                                            truncate(str(result))
-                                        )
-                                    )
-                                if isinstance(result, str):
-                                    result = result.encode("utf-8")
-                                response.app_iter = CompressedIterator(
-                                    io.BytesIO(result)
+            handler = self.error_handlers.get(response.status_code, None)
+            if handler is not None:
+                logger.debug("Found error handler {0}".format(handler))
+                try:
+                    result = handler(self, request, response)
+                    accepted_encodings = ""
+                    if request is not None:
+                        accepted_encodings = request.headers.get("Accept-Encoding", "")
+                    if (
+                        handler.compress_response
+                        and "gzip" in accepted_encodings
+                        and result
+                    ):
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                "Error handler compressing result {0}".format(
+                                    truncate(str(result))
                                 )
-                                response.headers["Content-Encoding"] = "gzip"
-                            elif isinstance(result, str):
-                                if logger.isEnabledFor(logging.DEBUG):
-                                    logger.debug(
-                                        "Error handler returning result {0}".format(
-                                            truncate(str(result))
-                                        )
-                                    )
-                                response.text = result
-                        except Exception as ex:
-                            logger.error(
-                                "Error handler raised exception {0}({1})".format(
-                                    type(ex).__name__, str(ex)
+                            )
+                        if isinstance(result, str):
+                            result = result.encode("utf-8")
+                        if len(result) < ERROR_BODY_COMPRESS_MAX_LENGTH:
+                            response.body = compress_error_body(result)
+                        else:
+                            response.app_iter = CompressedIterator(io.BytesIO(result))
+                        response.headers["Content-Encoding"] = "gzip"
+                    elif isinstance(result, str):
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                "Error handler returning result {0}".format(
+                                    truncate(str(result))
                                 )
                             )
-                            logger.debug(traceback.format_exc())
-                            response.status_code = 500
-                            response.text = self.format_exception(ex, request, response)
-                        break
+                        response.text = result
+                except Exception as ex:
+                    logger.error(
+                        "Error handler raised exception {0}({1})".format(
+                            type(ex).__name__, str(ex)
+                        )
+                    )
+                    logger.debug(traceback.format_exc())
+                    response.status_code = 500
+                    response.text = self.format_exception(ex, request, response)
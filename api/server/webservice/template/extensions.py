@@ -1,20 +1,99 @@
 from __future__ import annotations
-import math
-import jinja2.exceptions
+import numbers
+import jinja2
 
 from jinja2 import nodes
 from jinja2.ext import Extension
+from jinja2.exceptions import TemplateSyntaxError
 from jinja2.parser import Parser
 
-from typing import Callable, Any, Union, List
+from typing import Callable, Any, Optional, Union, List
 
 from fruition.api.base import APIBase
 from fruition.api.configuration import APIConfiguration
 
+# Divided out before the 6k±1 loop in prime_kernel, which then starts at 77.
+SMALL_PRIMES = (
+    2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73
+)
+
+# The largest value given to the compiled prime test. numba works in 64-bit integers,
+# and this keeps the square of its divisor from overflowing.
+PRIME_KERNEL_MAX = 2**62
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def prime_kernel(var: int) -> bool:
+    """
+    The prime test of ExampleTestExtension, in a form numba can compile. When numba
+    is installed, this is replaced by the compiled version, which is used for values
+    up to ``PRIME_KERNEL_MAX``; larger values use ``python_prime_kernel``.
+
+    >>> [var for var in range(30) if prime_kernel(var)]
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    """
+    if var < 2:
+        return False
+    for prime in SMALL_PRIMES:
+        if var == prime:
+            return True
+        if var % prime == 0:
+            return False
+    # Every other prime is one either side of a multiple of six.
+    i = 77
+    while i * i <= var:
+        if var % i == 0 or var % (i + 2) == 0:
+            return False
+        i += 6
+    return True
+
+
+# Python's integers don't overflow, so this handles values of any size.
+python_prime_kernel = prime_kernel
+
+if numba is not None:
+    prime_kernel = numba.njit(cache=True)(prime_kernel)
+
 
 class ExtensionBase:
-    getConfiguration: Callable[[], APIConfiguration]
-    getServer: Callable[[], APIBase]
+    """
+    Gives extensions access to the server and configuration of the
+    :class:`fruition.api.server.webservice.template.loader.TemplateLoader` that
+    created their environment.
+    """
+
+    __slots__ = ("environment",)
+
+    environment: jinja2.Environment
+
+    def getServer(self) -> Optional[APIBase]:
+        """
+        Gets the server of the loader. This is looked up on each call, so extension
+        classes are shared between loaders rather than bound to one.
+
+        >>> from fruition.api.configuration import APIConfiguration
+        >>> from fruition.api.server.webservice.template.loader import TemplateLoader
+        >>> from fruition.api.server.webservice.template.extensions import ExampleFunctionExtension
+        >>> first = TemplateLoader(APIConfiguration(), server = "first")
+        >>> second = TemplateLoader(APIConfiguration(), server = "second")
+        >>> first.extend(ExampleFunctionExtension)
+        >>> second.extend(ExampleFunctionExtension)
+        >>> first.environment.globals["square"].getServer()
+        'first'
+        >>> second.environment.globals["square"].getServer()
+        'second'
+        """
+        return getattr(self.environment, "template_loader").server
+
+    def getConfiguration(self) -> APIConfiguration:
+        """
+        Gets the configuration of the loader, looked up the same way as the server.
+        """
+        return getattr(self.environment, "template_loader").configuration
 
 
 class ContextExtensionBase(ExtensionBase, Extension):
@@ -37,22 +116,32 @@ class ContextExtensionBase(ExtensionBase, Extension):
     ''
     """
 
+    __slots__ = ()
+
     tags = {"context_extension_base"}
+    end_tokens = ("name:endcontext_extension_base",)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Works out the token that closes the context once, when the class is made.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.end_tokens = ("name:end{0}".format(next(iter(cls.tags))),)
 
     def parse(self, parser: Parser) -> nodes.Node:
         line = next(parser.stream).lineno
         context = nodes.ContextReference()
         args: List[Any] = [context]
 
+        parse_expression = parser.parse_expression
+        append = args.append
         while True:
             try:
-                args.append(parser.parse_expression())
-            except jinja2.exceptions.TemplateSyntaxError:
+                append(parse_expression())
+            except TemplateSyntaxError:
                 break
 
-        body = parser.parse_statements(
-            ("name:end{0}".format(list(self.tags)[0]),), drop_needle=True
-        )
+        body = parser.parse_statements(self.end_tokens, drop_needle=True)
         return nodes.CallBlock(
             self.call_method("_extension_callback", args), [], [], body
         ).set_lineno(line)
@@ -84,15 +173,19 @@ class StatementExtensionBase(ExtensionBase, Extension):
     'Add result here: '
     """
 
+    __slots__ = ()
+
     tags = {"statement_extension_base"}
 
     def parse(self, parser: Parser) -> nodes.Node:
         line = next(parser.stream).lineno
         args = []
+        parse_expression = parser.parse_expression
+        append = args.append
         while True:
             try:
-                args.append(parser.parse_expression())
-            except jinja2.exceptions.TemplateSyntaxError:
+                append(parse_expression())
+            except TemplateSyntaxError:
                 break
         return nodes.Output(
             [self.call_method("_extension_callback", args, lineno=line)], lineno=line
@@ -121,11 +214,15 @@ class TestExtensionBase(ExtensionBase):
     ''
     """
 
+    __slots__ = ()
+
     name = "test_extension_base"
 
     @classmethod
     def assign(cls, environment: jinja2.Environment) -> None:
-        environment.tests[cls.name] = cls()  # type: ignore
+        extension = cls()
+        extension.environment = environment
+        environment.tests[cls.name] = extension  # type: ignore
 
     def __call__(self, var: Any, *args: Any) -> bool:
         return False
@@ -147,11 +244,15 @@ class FilterExtensionBase(ExtensionBase):
     'foo'
     """
 
+    __slots__ = ()
+
     name = "filter_extension_base"
 
     @classmethod
     def assign(cls, environment: jinja2.Environment) -> None:
-        environment.filters[cls.name] = cls()
+        extension = cls()
+        extension.environment = environment
+        environment.filters[cls.name] = extension
 
     def __call__(self, var: Any) -> Any:
         return var
@@ -173,11 +274,15 @@ class FunctionExtensionBase(ExtensionBase):
     'foo'
     """
 
+    __slots__ = ()
+
     name = "function_extension_base"
 
     @classmethod
     def assign(cls, environment: jinja2.Environment) -> None:
-        environment.globals[cls.name] = cls()
+        extension = cls()
+        extension.environment = environment
+        environment.globals[cls.name] = extension
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         if args:
@@ -197,6 +302,8 @@ class ExampleFunctionExtension(FunctionExtensionBase):
     '16'
     """
 
+    __slots__ = ()
+
     name = "square"
 
     def __call__(self, var: Union[int, float]) -> Union[int, float]:
@@ -215,6 +322,8 @@ class ExampleFilterExtension(FilterExtensionBase):
     '16'
     """
 
+    __slots__ = ()
+
     name = "square"
 
     def __call__(self, var: Union[int, float]) -> Union[int, float]:
@@ -232,18 +341,32 @@ class ExampleTestExtension(TestExtensionBase):
     '5 is prime'
     >>> template.render(var = 6)
     '6 is not prime'
+    >>> [var for var in range(-1, 30) if ExampleTestExtension()(var)]
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    >>> ExampleTestExtension()(25)
+    False
+    >>> ExampleTestExtension()(7.0), ExampleTestExtension()(7.5), ExampleTestExtension()("7")
+    (True, False, False)
+    >>> ExampleTestExtension()(1000003 * 1000033)
+    False
     """
 
+    __slots__ = ()
+
     name = "prime"
 
     @classmethod
     def __call__(self, var: Any, *args: Any) -> bool:
-        if var == 2:
-            return True
-        for i in range(2, int(math.ceil(math.sqrt(var))) + 1):
-            if var % i == 0:
-                return False
-        return True
+        # Only whole numbers can be prime; everything after this is integer arithmetic.
+        if isinstance(var, numbers.Integral) or (
+            isinstance(var, float) and var.is_integer()
+        ):
+            var = int(var)
+        else:
+            return False
+        if numba is not None and 0 <= var <= PRIME_KERNEL_MAX:
+            return bool(prime_kernel(var))
+        return python_prime_kernel(var)
 
 
 class ExampleContextExtension(ContextExtensionBase):
@@ -255,6 +378,8 @@ class ExampleContextExtension(ContextExtensionBase):
     'prefixFOO bar BAZ'
     """
 
+    __slots__ = ()
+
     tags = {"example_context"}
 
     def __call__(
@@ -275,6 +400,8 @@ class ExampleStatementExtension(StatementExtensionBase):
     'xxxxxnnnnn'
     """
 
+    __slots__ = ()
+
     tags = {"example_statement"}
 
     def __call__(self, *args: Any) -> str:
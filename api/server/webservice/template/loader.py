@@ -1,8 +1,9 @@
 import os
 import jinja2
+import functools
 
 from jinja2.ext import Extension
-from typing import Optional, Callable, Any, Type, Union, Dict
+from typing import Optional, Any, Type, Union, Iterator, Tuple, Dict, Set
 
 from fruition.api.exceptions import ConfigurationError
 from fruition.api.configuration import APIConfiguration
@@ -17,6 +18,44 @@ from fruition.api.server.webservice.template.extensions import (
     FunctionExtensionBase,
 )
 
+# The number of rendered pieces to gather before yielding when streaming.
+TEMPLATE_STREAM_BUFFER_SIZE = 32
+
+# The kinds of extension ``TemplateLoader.extend()`` accepts, as (base class, name,
+# loader attribute listing them), checked in order.
+EXTENSION_KINDS: Tuple[Tuple[type, str, str], ...] = (
+    (TestExtensionBase, "test", "tests"),
+    (FilterExtensionBase, "filter", "filters"),
+    (FunctionExtensionBase, "function", "functions"),
+    (Extension, "extension", "extensions"),
+)
+
+
+def iterate_directories(root: str) -> Iterator[str]:
+    """
+    Yields a directory and all directories beneath it, in the same order as
+    ``os.walk``, without looking at any files. Symbolic links aren't followed, and
+    directories that can't be read are skipped.
+
+    >>> import os, tempfile
+    >>> from fruition.api.server.webservice.template.loader import iterate_directories
+    >>> root = tempfile.mkdtemp()
+    >>> os.makedirs(os.path.join(root, "a", "b"))
+    >>> open(os.path.join(root, "a", "c.html"), "w").close()
+    >>> [os.path.relpath(directory, root) for directory in iterate_directories(root)]
+    ['.', 'a', 'a/b']
+    """
+    try:
+        with os.scandir(root) as entries:
+            subdirectories = [
+                entry.path for entry in entries if entry.is_dir(follow_symlinks=False)
+            ]
+    except OSError:
+        return
+    yield root
+    for subdirectory in subdirectories:
+        yield from iterate_directories(subdirectory)
+
 
 class TemplateLoader:
     """
@@ -53,6 +92,9 @@ class TemplateLoader:
     - `server.template.directories` Either a single or list of directories to look for template files in.
     - `server.template.static` A static dictionary of (template_name, template_string).
     - `server.template.extensions` A list of string fully-qualified names or types. See `fruition.api.server.webservice.html.template.extensions`.
+    - `server.template.bytecode_cache_dir` A directory to store compiled templates in, including those rendered from strings, so they can be reused across processes. Created if it does not exist.
+    - `server.template.string_cache_size` How many templates rendered from strings (``template=False``) to keep compiled. Defaults to 256.
+    - `server.template.reload` Whether to check templates for changes on disk before using them. Defaults to true; set to false in production to skip the checks.
     """
 
     def __init__(
@@ -70,9 +112,14 @@ class TemplateLoader:
             self.directories = [
                 directory
                 for template_directory in self.directories
-                for directory, subdirectory, filenames in os.walk(template_directory)
+                for directory in iterate_directories(template_directory)
             ]
 
+        # Only used to explain a missing template, so checked once rather than per miss.
+        self.directories_exist = {
+            directory: os.path.isdir(directory) for directory in self.directories
+        }
+
         self.extensions = self.configuration.get("server.template.extensions", [])
         if not isinstance(self.extensions, list):
             self.extensions = [self.extensions]
@@ -85,17 +132,6 @@ class TemplateLoader:
             for extension in self.extensions
         ]
 
-        # Add in Lambdas
-
-        lambdas: Dict[str, Callable] = {}
-        lambdas["getServer"] = lambda *args: self.server
-        lambdas["getConfiguration"] = lambda *args: self.configuration
-
-        self.extensions = [
-            type("{0}Extension".format(extension.__name__), (extension,), lambdas)
-            for extension in self.extensions
-        ]
-
         # Filter out ones that needs to be assigned later
 
         self.tests = [
@@ -119,18 +155,76 @@ class TemplateLoader:
             if issubclass(extension, Extension)
         ]
 
+        # Sets of each kind of extension, kept alongside the lists to find duplicates.
+        self.extension_sets: Dict[str, Set[type]] = {
+            attribute: set(getattr(self, attribute))
+            for _, _, attribute in EXTENSION_KINDS
+        }
+
         self.loader = jinja2.ChoiceLoader(
             [jinja2.DictLoader(self.static), jinja2.FileSystemLoader(self.directories)]
         )
+
+        bytecode_cache: Optional[jinja2.BytecodeCache] = None
+        bytecode_cache_dir = self.configuration.get(
+            "server.template.bytecode_cache_dir", None
+        )
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(
+                directory=bytecode_cache_dir, pattern="%s.cache"
+            )
+
         self.environment = jinja2.Environment(
-            extensions=self.extensions, loader=self.loader
+            extensions=self.extensions,
+            loader=self.loader,
+            bytecode_cache=bytecode_cache,
+            auto_reload=bool(self.configuration.get("server.template.reload", True)),
         )
+        # Extensions find the server and configuration through their environment.
+        self.environment.extend(template_loader=self)
 
         # Assign later extensions
         for assignable_extension_type in [self.tests, self.filters, self.functions]:
             for assignable_extension in assignable_extension_type:
                 assignable_extension.assign(self.environment)
 
+        string_cache_size = self.configuration.get(
+            "server.template.string_cache_size", 256
+        )
+        self.compile_string = functools.lru_cache(maxsize=int(string_cache_size))(
+            self.load_string
+        )
+
+    def load_string(self, source: str) -> jinja2.Template:
+        """
+        Compiles a template from a string. When a bytecode cache is configured, the
+        compiled code is stored there keyed by the source, so strings rendered before
+        aren't parsed again in a new process.
+
+        >>> import tempfile
+        >>> from fruition.api.configuration import APIConfiguration
+        >>> from fruition.api.server.webservice.template.loader import TemplateLoader
+        >>> configuration = APIConfiguration(**{"server": {"template": {"bytecode_cache_dir": tempfile.mkdtemp()}}})
+        >>> TemplateLoader(configuration).load_string("{{ var }}!").render(var = 1)
+        '1!'
+        >>> TemplateLoader(configuration).load_string("{{ var }}!").render(var = 2)
+        '2!'
+
+        :param source str: The template source.
+        :returns jinja2.Template: The template.
+        """
+        bytecode_cache = self.environment.bytecode_cache
+        if bytecode_cache is None:
+            return self.environment.from_string(source)
+        bucket = bytecode_cache.get_bucket(self.environment, source, None, source)
+        if bucket.code is None:
+            bucket.code = self.environment.compile(source)
+            bytecode_cache.set_bucket(bucket)
+        return self.environment.template_class.from_code(
+            self.environment, bucket.code, self.environment.make_globals(None), None
+        )
+
     def extend(
         self,
         *extensions: Union[
@@ -141,80 +235,58 @@ class TemplateLoader:
         ]
     ) -> None:
         """
-        Adds an extension after initial creation.
+        Adds an extension after initial creation. Templates compiled from strings are
+        dropped, as they may have been compiled without it.
 
         :param extensions list<Extension>: Either a jinja2.ext.Extension or any of the extensions in the template extension directory.
         """
-        lambdas: Dict[str, Callable] = {}
-        lambdas["getServer"] = lambda *args: self.server
-        lambdas["getConfiguration"] = lambda *args: self.configuration
         for extension in extensions:
-            extension = type(
-                "{0}Extension".format(extension.__name__), (extension,), lambdas
-            )
-
-            if issubclass(extension, TestExtensionBase):
-                if extension in self.tests:
-                    logger.debug(
-                        "Tried to extend template loader with duplicate test {0}".format(
-                            extension
-                        )
-                    )
-                    return
-                logger.debug("Template loader adding test {0}".format(extension))
-                self.tests.append(extension)
-                extension.assign(self.environment)
-            elif issubclass(extension, FilterExtensionBase):
-                if extension in self.filters:
-                    logger.debug(
-                        "Tried to extend template loader with duplicate filter {0}".format(
-                            extension
-                        )
-                    )
-                    return
-                logger.debug("Template loader adding filter {0}".format(extension))
-                self.filters.append(extension)
-                extension.assign(self.environment)
-            elif issubclass(extension, FunctionExtensionBase):
-                if extension in self.functions:
-                    logger.debug(
-                        "Tried to extend template loader with duplicate function {0}".format(
-                            extension
-                        )
-                    )
-                    return
-                logger.debug("Template loader adding function {0}".format(extension))
-                self.functions.append(extension)
-                extension.assign(self.environment)
-            elif issubclass(extension, Extension):
-                if extension in self.extensions:
-                    logger.debug(
-                        "Tried to extend template loader with duplicate extension {0}".format(
-                            extension
-                        )
-                    )
-                    return
-                logger.debug("Template loader adding extension {0}".format(extension))
-                self.extensions.append(extension)
-                self.environment.add_extension(extension)
+            for base, kind, attribute in EXTENSION_KINDS:
+                if issubclass(extension, base):
+                    break
             else:
                 raise ConfigurationError(
                     "Extension does not extend either a base or assignable Jinja2 extension."
                 )
+            known = self.extension_sets[attribute]
+            if extension in known:
+                logger.debug(
+                    "Tried to extend template loader with duplicate {0} {1}".format(
+                        kind, extension
+                    )
+                )
+                return
+            logger.debug("Template loader adding {0} {1}".format(kind, extension))
+            getattr(self, attribute).append(extension)
+            known.add(extension)
+            if base is Extension:
+                self.environment.add_extension(extension)
+            else:
+                extension.assign(self.environment)
+            self.compile_string.cache_clear()
 
-    def render(self, name: str, template: Optional[bool] = True, **context: Any) -> str:
+    def get_template(
+        self, name: str, template: Optional[bool] = True
+    ) -> jinja2.Template:
         """
-        Renders a template name with optional context.
+        Gets a compiled template by name, or from a string. Templates from strings are
+        compiled once and kept, up to ``server.template.string_cache_size`` of them.
 
-        :param name str: The name (path) of the template to render.
-        :param context dict: A dictionary of context to pass into the template.
-        :returns str: The rendered content.
-        :raises TemplateNotFoundException: When the template is not found by the loader.
+        >>> from fruition.api.configuration import APIConfiguration
+        >>> from fruition.api.server.webservice.template.loader import TemplateLoader
+        >>> loader = TemplateLoader(APIConfiguration())
+        >>> loader.get_template("{{ var }}", False) is loader.get_template("{{ var }}", False)
+        True
+
+        :param name str: The name (path) of the template, or the template itself when ``template`` is false.
+        :param template bool: Whether ``name`` is the name of a template (true) or the template source (false).
+        :returns jinja2.Template: The template.
+        :raises ConfigurationError: When the template is not found by the loader.
         """
         try:
             if not template:
-                return self.environment.from_string(name).render(**context)
-            return self.environment.get_template(name).render(**context)
+                return self.compile_string(name)
+            return self.environment.get_template(name)
         except jinja2.exceptions.TemplateNotFound:
             raise ConfigurationError(
                 "Couldn't find template {0}. Tried:\r\n{1}".format(
@@ -225,7 +297,7 @@ class TemplateLoader:
                                 i + 1,
                                 directory,
                                 ""
-                                if os.path.isdir(directory)
+                                if self.directories_exist.get(directory, False)
                                 else " (NOT FOUND/PERMISSION ERROR)",
                             )
                             for i, directory in enumerate(self.directories)
@@ -233,3 +305,38 @@ class TemplateLoader:
                     ),
                 )
             )
+
+    def render(self, name: str, template: Optional[bool] = True, **context: Any) -> str:
+        """
+        Renders a template name with optional context.
+
+        :param name str: The name (path) of the template to render.
+        :param context dict: A dictionary of context to pass into the template.
+        :returns str: The rendered content.
+        :raises ConfigurationError: When the template is not found by the loader.
+        """
+        return self.get_template(name, template).render(**context)
+
+    def stream(
+        self, name: str, template: Optional[bool] = True, **context: Any
+    ) -> Iterator[str]:
+        """
+        Renders a template name with optional context a piece at a time.
+
+        The template is found immediately, but errors in rendering will only be raised
+        while iterating.
+
+        >>> from fruition.api.configuration import APIConfiguration
+        >>> from fruition.api.server.webservice.template.loader import TemplateLoader
+        >>> configuration = APIConfiguration(**{"server": {"template": {"static": {"test": "{% for i in range(3) %}{{ i }}{% endfor %}"}}}})
+        >>> "".join(TemplateLoader(configuration).stream("test"))
+        '012'
+
+        :param name str: The name (path) of the template to render.
+        :param context dict: A dictionary of context to pass into the template.
+        :returns Iterator[str]: The rendered content, in pieces.
+        :raises ConfigurationError: When the template is not found by the loader.
+        """
+        stream = self.get_template(name, template).stream(**context)
+        stream.enable_buffering(TEMPLATE_STREAM_BUFFER_SIZE)
+        return stream
@@ -8,10 +8,10 @@ except ImportError:
     sys.stderr.flush()
     raise
 
+import numpy
 import sqlalchemy
 
-from typing import Any, List, Dict
-from statistics import median
+from typing import Any, List, Dict, cast
 from fruition.util.log import logger
 from fruition.database.engine import EngineFactory
 from fruition.database.util import row_to_dict
@@ -67,18 +67,33 @@ class DeDuplicator:
 
         Notably this turns it into a dictionary, and turns empty strings into "None".
         """
-        row_dict = row_to_dict(row)
-        return dict(
-            [
-                (
-                    key,
-                    row_dict[key]
-                    if not (isinstance(row_dict[key], str) and len(row_dict[key]) == 0)
-                    else None,
-                )
-                for key in row_dict
-            ]
-        )
+        return {
+            key: None if isinstance(value, str) and not value else value
+            for key, value in row_to_dict(row).items()
+        }
+
+    def reflect_source_table(
+        self, meta: sqlalchemy.MetaData, engine: Any
+    ) -> sqlalchemy.Table:
+        """
+        Gets the source table in the given metadata. The database is only introspected
+        the first time; afterwards the table found then is copied into ``meta``.
+
+        :param meta sqlalchemy.MetaData: The metadata to put the table in.
+        :param engine sqlalchemy.engine.Engine: The engine to introspect with.
+        :returns sqlalchemy.Table: The source table.
+        """
+        source_table = getattr(self, "source_table", None)
+        if source_table is None:
+            self.source_table = sqlalchemy.Table(
+                self.tablename, meta, autoload=True, autoload_with=engine
+            )
+            return self.source_table
+        # Renamed from tometadata() in SQLAlchemy 1.4
+        to_metadata = getattr(source_table, "to_metadata", None)
+        if to_metadata is None:
+            to_metadata = source_table.tometadata
+        return cast(sqlalchemy.Table, to_metadata(meta))
 
     def gather(self) -> None:
         """
@@ -88,17 +103,16 @@ class DeDuplicator:
         with self.factory as factory:
             engine = next(iter(factory[self.database_type]))
             meta = sqlalchemy.MetaData(engine)
-            table = sqlalchemy.Table(
-                self.tablename, meta, autoload=True, autoload_with=engine
-            )
+            table = self.reflect_source_table(meta, engine)
 
             logger.info("Source table introspected, gathering data.")
-            self.data = dict(
-                [
-                    (i, self.sample(row))
-                    for i, row in enumerate(engine.execute(table.select()).fetchall())
-                ]
+            # Server-side cursors (where supported) keep only one copy of the data around.
+            result = engine.execute(
+                table.select().execution_options(stream_results=True)
             )
+            self.data = {}
+            for i, row in enumerate(result):
+                self.data[i] = self.sample(row)
 
     def train(self) -> None:
         """
@@ -127,7 +141,7 @@ class DeDuplicator:
             dedupe.convenience.consoleLabel(self.deduper)
             self.deduper.train()
 
-            with open(self.training_file, "w") as fp:
+            with open(self.training_file, "w", encoding="utf-8") as fp:
                 self.deduper.writeTraining(fp)
 
             with open(self.settings_file, "wb") as fp:
@@ -159,9 +173,7 @@ class DeDuplicator:
             except sqlalchemy.exc.NoSuchTableError:
                 pass
 
-            source_table = sqlalchemy.Table(
-                self.tablename, meta, autoload=True, autoload_with=engine
-            )
+            source_table = self.reflect_source_table(meta, engine)
 
             table = sqlalchemy.Table(
                 "{0}_clustered_sets".format(self.tablename),
@@ -187,32 +199,39 @@ class DeDuplicator:
 
             meta.create_all()
 
+            # Sorted once, the count above each threshold is a binary search.
+            medians = numpy.sort(
+                numpy.fromiter(
+                    (numpy.median(cluster[1]) for cluster in self.clustered_duplicates),
+                    dtype=numpy.float64,
+                    count=len(self.clustered_duplicates),
+                )
+            )
             for min_int in range(10):
                 minimum = min_int / 10
                 logger.info(
                     "Duplicates with likeliness above threshold {0:0.2f}: {1:d}".format(
                         minimum,
-                        len(
-                            [
-                                cluster
-                                for cluster in self.clustered_duplicates
-                                if median(cluster[1]) >= minimum
-                            ]
-                        ),
+                        len(medians) - int(numpy.searchsorted(medians, minimum)),
                     )
                 )
 
-            for i, cluster in enumerate(self.clustered_duplicates):
-                engine.execute(
-                    table.insert(),
-                    [
-                        {
-                            self.unique_key: self.data[uid][self.unique_key],
-                            "score": float(score),
-                            "cluster_id": i,
-                        }
-                        for uid, score in zip(cluster[0], cluster[1])
-                    ],
-                )
+            unique_key = self.unique_key
+            data = self.data
+            rows = [
+                {
+                    unique_key: data[uid][unique_key],
+                    "score": float(score),
+                    "cluster_id": i,
+                }
+                for i, (uids, scores) in enumerate(self.clustered_duplicates)
+                for uid, score in zip(uids, scores)
+            ]
+
+            # Insert in one transaction, STEP_SIZE rows per executemany.
+            with engine.begin() as connection:
+                insert = table.insert()
+                for start in range(0, len(rows), self.STEP_SIZE):
+                    connection.execute(insert, rows[start : start + self.STEP_SIZE])
 
         logger.info("Clustering complete.")
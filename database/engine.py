@@ -2,23 +2,126 @@ from __future__ import annotations
 
 import sqlalchemy
 import os
+import logging
+import functools
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from types import MappingProxyType
 
 try:
     import pyodbc
 except ImportError:
     pyodbc = None
 
-from typing import Any, List, Dict, cast
-from typing_extensions import Self
-
+from typing import (
+    Any,
+    List,
+    Dict,
+    Tuple,
+    Iterator,
+    Iterable,
+    Callable,
+    Hashable,
+    Mapping,
+    Optional,
+    cast,
+)
+
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 from sqlalchemy.engine.url import URL
 from sqlalchemy.engine.base import Engine as EngineBase
 from fruition.util.log import logger
+from fruition.api.exceptions import ConfigurationError
 
 from sqlalchemy.schema import DropTable
 from sqlalchemy.ext.compiler import compiles
 
-os.environ["TDSVER"] = "8.0"
+# Calling URL() directly was replaced by URL.create() in SQLAlchemy 1.4. The query
+# dictionary is passed as-is, so Engine stores its values as strings ahead of time.
+create_url = getattr(URL, "create", URL)
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Turns a configuration value into something hashable, with equal values giving
+    equal results.
+
+    >>> from fruition.database.engine import freeze
+    >>> freeze({"query": {"a": [1, 2]}}) == freeze({"query": {"a": [1, 2]}})
+    True
+    >>> freeze({"query": {"a": [1, 2]}}) == freeze({"query": {"a": [2, 1]}})
+    False
+
+    :param value object: The value to freeze.
+    :returns Hashable: The frozen value.
+    """
+    if isinstance(value, dict):
+        return frozenset([(key, freeze(inner)) for key, inner in value.items()])
+    if isinstance(value, (list, tuple)):
+        return tuple([freeze(inner) for inner in value])
+    if isinstance(value, set):
+        return frozenset([freeze(inner) for inner in value])
+    return cast(Hashable, value)
+
+
+DISPOSE_MAX_WORKERS = 16
+
+
+def dispose_all(disposers: Iterable[Callable[[], Any]]) -> None:
+    """
+    Calls each of the disposers, in parallel when there is more than one. Closing a
+    pool waits on the server for every connection, so this keeps teardown of many
+    engines from adding up. Exceptions are raised once all disposers have run.
+
+    >>> disposed = []
+    >>> dispose_all([lambda: disposed.append(1), lambda: disposed.append(2)])
+    >>> sorted(disposed)
+    [1, 2]
+    """
+    disposers = list(disposers)
+    if len(disposers) < 2:
+        for disposer in disposers:
+            disposer()
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(DISPOSE_MAX_WORKERS, len(disposers))
+    ) as executor:
+        futures = [executor.submit(disposer) for disposer in disposers]
+    for future in futures:
+        future.result()
+
+
+def decode_sketchy_utf16(raw_bytes: bytes) -> str:
+    """
+    Decodes a UTF-16 string from ODBC, which may run past its null terminator.
+
+    >>> from fruition.database.engine import decode_sketchy_utf16
+    >>> decode_sketchy_utf16("abc\\u0000def".encode("utf-16le"))
+    'abc'
+    """
+    # Find the null terminator before decoding, so only the string itself is decoded.
+    # It must start on a code unit boundary; a match at an odd offset spans two units.
+    end = len(raw_bytes)
+    start = 0
+    while True:
+        found = raw_bytes.find(b"\x00\x00", start)
+        if found < 0:
+            break
+        if found % 2 == 0:
+            end = found
+            break
+        start = found + 1
+    return raw_bytes[:end].decode("utf-16le", "ignore")
+
+
+def add_pyodbc_converters(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    Installs output converters on each new PyODBC connection, as a ``connect`` event.
+    """
+    dbapi_connection.add_output_converter(pyodbc.SQL_WVARCHAR, decode_sketchy_utf16)
 
 
 @compiles(DropTable, "postgresql")  # type: ignore
@@ -40,23 +143,83 @@ class Engine:
     :param username str: A username to use for authentication. This authentication is handled by the driver, so the method varies.
     :param password str: A password to use for authentication.
     :param database str: An initial database to connect to. If ommitted, the engine will connect to "default" initially.
+    :param pool_size int: The number of connections to keep open per database. Defaults to 10.
+    :param max_overflow int: The number of connections to allow beyond ``pool_size`` under load. Defaults to 20.
+    :param pool_timeout int: Seconds to wait for a connection when the pool is exhausted. Defaults to 30.
+    :param pool_recycle int: Seconds after which a connection is replaced rather than reused. Defaults to 1800.
+    :param pool_pre_ping bool: Whether to test connections before using them. Defaults to true.
+
+    :param warm_pool_size int: The number of connections to open and test when an engine is created, so the first queries don't wait on connecting. At most ``pool_size``. Defaults to 0, so connections are only opened when first used.
+
+    :param pool_class str: The kind of connection pool to use, one of "queue", "static" or "null". "null" opens a new connection for every checkout, which suits short-lived processes. By default, the driver's own choice is used, except for in-memory SQLite databases, which use "static" so every thread sees the same database.
+
+    :param share_pool bool: For PostgreSQL and SQL Server, serve every database name from the default database's connection pool, treating the name as a schema (``name.dbo`` on SQL Server) instead of connecting to it. Defaults to false.
+
+    Pool parameters are only used for "queue" pools, which is the default for every driver except SQLite.
     """
 
-    KNOWN_KEYS = ["drivername", "username", "password", "host", "port", "database"]
+    POOL_CLASSES = {"queue": QueuePool, "static": StaticPool, "null": NullPool}
+
+    SHARED_POOL_DRIVERS = ("postgresql", "mssql")
+    # Hive and Impala don't have transactions, so rolling back on check-in fails.
+    NO_RESET_DRIVERS = ("impala", "hive")
+
+    KNOWN_KEYS = frozenset(
+        ["drivername", "username", "password", "host", "port", "database"]
+    )
+    POOL_KEYS = frozenset(
+        ["pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"]
+    )
+    POOL_DEFAULTS: Dict[str, Any] = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
 
     engines: Dict[str, EngineBase]
+    urls: Dict[str, URL]
 
     def __init__(self, name: str, **connection_params: Any):
         self.name = name
         self.connection_params = {}
-        for key in connection_params:
+        self.pool_params = {**Engine.POOL_DEFAULTS}
+        self.warm_pool_size = 0
+        self.share_pool = False
+        self.pool_class = None
+        for key, value in connection_params.items():
             if key in Engine.KNOWN_KEYS:
-                self.connection_params[key] = connection_params[key]
+                self.connection_params[key] = value
+            elif key in Engine.POOL_KEYS:
+                self.pool_params[key] = value
+            elif key == "warm_pool_size":
+                self.warm_pool_size = int(value)
+            elif key == "share_pool":
+                self.share_pool = bool(value)
+            elif key == "pool_class":
+                pool_class = str(value).lower()
+                if pool_class not in Engine.POOL_CLASSES:
+                    raise ConfigurationError(
+                        "Unknown pool class {0}, expected one of {1}.".format(
+                            pool_class, ", ".join(Engine.POOL_CLASSES)
+                        )
+                    )
+                self.pool_class = Engine.POOL_CLASSES[pool_class]
             else:
                 if "query" not in self.connection_params:
                     self.connection_params["query"] = {}
-                self.connection_params["query"][key] = connection_params[key]
+                # URL.create() only accepts strings, or sequences of them
+                if isinstance(value, (list, tuple)):
+                    value = tuple(str(item) for item in value)
+                else:
+                    value = str(value)
+                self.connection_params["query"][key] = value
         self.engines = {}
+        self.urls = {}
+        self.share_pool = self.share_pool and self.connection_params[
+            "drivername"
+        ].startswith(Engine.SHARED_POOL_DRIVERS)
         if "database" in self.connection_params:
             self._default_database = str(self.connection_params.pop("database"))
             if self.connection_params["drivername"].startswith(
@@ -76,29 +239,33 @@ class Engine:
             self._default_database = "default"
         self._create_engine(self._default_database)
 
-    def __iter__(self) -> Self:
-        self._iterkeys = list(self.engines.keys())
-        self._iterindex = 0
-        return self
-
-    def __next__(self) -> EngineBase:
-        if self._iterindex > len(self._iterkeys):
-            raise StopIteration
-        _engine = self.engines[self._iterkeys[self._iterindex]]
-        self._iterindex += 1
-        return _engine
+    def __iter__(self) -> Iterator[EngineBase]:
+        """
+        Iterates over the engines created so far. Engines created while iterating
+        aren't included.
+        """
+        return iter(tuple(self.engines.values()))
 
     def __getattr__(self, database_name: str) -> EngineBase:
-        if database_name not in self.engines:
-            self._create_engine(database_name)
-        return self.engines[database_name]
+        if database_name.startswith("_"):
+            # Don't open connections for probes like __setstate__ or _repr_html_
+            raise AttributeError(database_name)
+        return self[database_name]
 
     def __delattr__(self, database_name: str) -> None:
-        if database_name in self.engines:
-            self.engines[database_name].dispose()
+        engine = self.engines.pop(database_name, None)
+        self.urls.pop(database_name, None)
+        if engine is None:
+            return
+        if self.share_pool and database_name != self._default_database:
+            # Only a view of the default engine, don't close its pool
+            return
+        engine.dispose()
 
     def __getitem__(self, database_name: str) -> EngineBase:
-        return getattr(self, database_name)
+        if database_name not in self.engines:
+            self._create_engine(database_name)
+        return self.engines[database_name]
 
     def __delitem__(self, database_name: str) -> None:
         return delattr(self, database_name)
@@ -107,32 +274,89 @@ class Engine:
         """
         Builds the actual SQLAlchemy engine.
         """
-        conn_string = URL(**{**self.connection_params, **{"database": database_name}})
-        logger.info(
-            "Creating SQLAlchemy engine using connection string {0}".format(conn_string)
-        )
+        if self.share_pool and database_name != self._default_database:
+            self.engines[database_name] = self._create_schema_engine(database_name)
+            return
+        conn_string = self.urls.get(database_name, None)
+        if conn_string is None:
+            conn_string = create_url(**self.connection_params, database=database_name)
+            self.urls[database_name] = conn_string
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Creating SQLAlchemy engine using connection string {0}".format(
+                    conn_string
+                )
+            )
+        engine_params: Dict[str, Any] = {}
+        sqlite = self.connection_params["drivername"].startswith("sqlite")
+        pool_class = self.pool_class
+        memory = sqlite and database_name == ":memory:"
+        if pool_class is None and memory:
+            # Each connection would otherwise get its own, empty, database
+            pool_class = StaticPool
+        if pool_class is StaticPool and memory:
+            # The one connection is used by every thread
+            engine_params["connect_args"] = {"check_same_thread": False}
+        if pool_class is not None:
+            engine_params["poolclass"] = pool_class
+        pooled = pool_class is QueuePool or (pool_class is None and not sqlite)
+        if pooled:
+            engine_params.update(self.pool_params)
+        if self.connection_params["drivername"].startswith("mssql"):
+            # Read by FreeTDS when it first loads, if that's the ODBC driver in use
+            os.environ.setdefault("TDSVER", "8.0")
+        reset_on_return = "rollback"
+        if self.connection_params["drivername"].startswith(Engine.NO_RESET_DRIVERS):
+            reset_on_return = None
         self.engines[database_name] = sqlalchemy.create_engine(
             conn_string,
-            pool_reset_on_return=None,
+            pool_reset_on_return=reset_on_return,
+            **engine_params,
         )
         if "pyodbc" in self.connection_params["drivername"]:
             if pyodbc is None:
                 raise OSError(
                     "Failed to import PyODBC. This server/container likely needs ODBC configuration."
                 )
+            event.listen(
+                self.engines[database_name], "connect", add_pyodbc_converters
+            )
+        if pooled and self.warm_pool_size > 0:
+            self._warm_pool(database_name)
+
+    def _create_schema_engine(self, database_name: str) -> EngineBase:
+        """
+        Builds an engine that uses the default database's pool, but puts unqualified
+        tables in the schema named after the database.
+        """
+        schema = database_name
+        if self.connection_params["drivername"].startswith("mssql"):
+            schema = "{0}.dbo".format(database_name)
+        return self[self._default_database].execution_options(
+            schema_translate_map={None: schema}
+        )
 
-            def decode_sketchy_utf16(raw_bytes: bytes) -> str:
-                s = raw_bytes.decode("utf-16le", "ignore")
-                try:
-                    n = s.index("\u0000")
-                    s = s[:n]  # respect null terminator
-                except ValueError:
-                    pass
-                return s
-
-            self.engines[database_name].connect().connection.add_output_converter(
-                pyodbc.SQL_WVARCHAR, decode_sketchy_utf16
+    def _warm_pool(self, database_name: str) -> None:
+        """
+        Opens and tests up to ``warm_pool_size`` connections, then returns them to the
+        pool. Failures are logged, and the engine will connect on demand as usual.
+        """
+        engine = self.engines[database_name]
+        connections = []
+        try:
+            for i in range(min(self.warm_pool_size, self.pool_params["pool_size"])):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(sqlalchemy.text("SELECT 1"))
+        except Exception as ex:
+            logger.warning(
+                "Could not warm connection pool for database {0}. {1}: {2}".format(
+                    database_name, type(ex).__name__, ex
+                )
             )
+        finally:
+            for connection in connections:
+                connection.close()
 
     def default(self) -> EngineBase:
         return self[self._default_database]
@@ -141,30 +365,43 @@ class Engine:
         """
         Closes all engines.
         """
-        for database_name in self.engines:
-            conn_string = URL(
-                **{**self.connection_params, **{"database": database_name}}
-            )
-            logger.info(
-                "Shedding SQLAlchemy engine for connection string {0}".format(
-                    conn_string
+        log_urls = logger.isEnabledFor(logging.INFO)
+        disposers = []
+        for database_name, engine in self.engines.items():
+            if self.share_pool and database_name != self._default_database:
+                # Shares the default engine's pool
+                continue
+            if log_urls:
+                logger.info(
+                    "Shedding SQLAlchemy engine for connection string {0}".format(
+                        self.urls[database_name]
+                    )
                 )
-            )
-            try:
-                self.engines[database_name].dispose()
-            except Exception:
-                pass
+            disposers.append(functools.partial(Engine._dispose_quietly, engine))
+        dispose_all(disposers)
+        # URLs are kept, should any of these databases be opened again.
         self.engines = {}
 
+    @staticmethod
+    def _dispose_quietly(engine: EngineBase) -> None:
+        try:
+            engine.dispose()
+        except Exception:
+            pass
+
 
 class NoEngine:
     def __init__(self, name: str):
         self.name = name
+        self.message = "The engine for database type {0} is not configured.".format(
+            name
+        )
 
     def __getattr__(self, key: str) -> Any:
-        raise NotImplementedError(
-            "The engine for database type {0} is not configured.".format(self.name)
-        )
+        if key.startswith("__") and key.endswith("__"):
+            # Lets pickle, copy and repr() fall back to their defaults
+            raise AttributeError(key)
+        raise NotImplementedError(self.message)
 
 
 class EngineFactory:
@@ -174,43 +411,61 @@ class EngineFactory:
     :param kwargs dict: A dictionary containing "key" => "configuration" pairs, where "configuration" is a dictionary containing necessary configuration keys.
     """
 
-    DEFAULTS: Dict[str, Dict[str, Any]] = {
-        "postgres": {
-            "drivername": "postgresql+psycopg2",
-            "database": "default",
-        },
-        "impala": {
-            "drivername": "impala",
-            "auth_mechanism": "NOSASL",
-            "database": "default",
-        },
-        "hive": {
-            "drivername": "hive",
-            "auth": "NONE",
-            "database": "default",
-        },
-        "mssql": {
-            "drivername": "mssql+pyodbc_mssql",
-            "database": "default",
-            "driver": "ODBC Driver 17 for SQL Server",
-        },
-        "sqlite": {"drivername": "sqlite", "database": ":memory:"},
-        "mysql": {
-            "drivername": "mysql",
-            "database": "default",
-        },
-    }
+    DEFAULTS: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+        {
+            "postgres": MappingProxyType(
+                {
+                    "drivername": "postgresql+psycopg2",
+                    "database": "default",
+                }
+            ),
+            "impala": MappingProxyType(
+                {
+                    "drivername": "impala",
+                    "auth_mechanism": "NOSASL",
+                    "database": "default",
+                }
+            ),
+            "hive": MappingProxyType(
+                {
+                    "drivername": "hive",
+                    "auth": "NONE",
+                    "database": "default",
+                }
+            ),
+            "mssql": MappingProxyType(
+                {
+                    "drivername": "mssql+pyodbc_mssql",
+                    "database": "default",
+                    "driver": "ODBC Driver 17 for SQL Server",
+                }
+            ),
+            "sqlite": MappingProxyType({"drivername": "sqlite", "database": ":memory:"}),
+            "mysql": MappingProxyType(
+                {
+                    "drivername": "mysql",
+                    "database": "default",
+                }
+            ),
+        }
+    )
 
     configuration: Dict[str, Dict[str, Any]]
-    stores: List[EngineStore]
+    store_index: Dict[Tuple[str, Hashable], EngineStore]
+    engine_keys: Dict[int, Tuple[str, Hashable]]
 
     def __init__(self, **kwargs: Dict[str, Any]):
         self.configuration = {}
-        for key in EngineFactory.DEFAULTS:
-            self.configuration[key] = {**EngineFactory.DEFAULTS[key]}
-        for key in kwargs:
-            self.configuration[key].update(kwargs[key])
-        self.stores = []
+        self.configure(**kwargs)
+        self.store_index = {}
+        self.engine_keys = {}
+
+    @property
+    def stores(self) -> List[EngineFactory.EngineStore]:
+        """
+        The engine stores created so far, in order of creation.
+        """
+        return list(self.store_index.values())
 
     def configure(self, **kwargs: Any) -> None:
         """
@@ -219,35 +474,77 @@ class EngineFactory:
         :param kwargs dict: The configuration to update, see constructor for details.
         """
         for key in kwargs:
-            self.configuration[key].update(kwargs[key])
+            # Only overridden engine types are copied, the rest read from DEFAULTS.
+            self.configuration[key] = {
+                **self.configuration.get(key, EngineFactory.DEFAULTS.get(key, {})),
+                **kwargs[key],
+            }
 
     def get(self, engine_type: str, **configuration: Any) -> Engine:
         """
         Gets an engine based on engine type.
 
-        An optional second argument will override any configured default values. This will first iterate through existing engines to ensure we aren't duplicating effort.
+        An optional second argument will override any configured default values. This will first look for an existing engine with the same configuration to ensure we aren't duplicating effort.
 
         :param engine_type str: The engine type. See EngineFactory.DEFAULTS, the keys present there are known engine types - though using SQLAlchemy means this can be extended.
         :param configuration dict: Any configuration to override default values with.
         :return fruition.database.engine.Engine: The engine requested.
         """
-        configuration = {**self.configuration.get(engine_type, {}), **configuration}
-        for store in self.stores:
-            if (
-                store.engine_type == engine_type
-                and store.configuration == configuration
-            ):
-                return store.engine
-        store = EngineFactory.EngineStore(engine_type, **configuration)
-        self.stores.append(store)
+        configuration = {
+            **self.configuration.get(
+                engine_type, EngineFactory.DEFAULTS.get(engine_type, {})
+            ),
+            **configuration,
+        }
+        key = (engine_type, freeze(configuration))
+        store = self.store_index.get(key, None)
+        if store is None:
+            store = EngineFactory.EngineStore(engine_type, **configuration)
+            self.store_index[key] = store
+            self.engine_keys[id(store.engine)] = key
         return store.engine
 
+    @staticmethod
+    def is_shareable(engine_type: str, **engine_kwargs: Any) -> bool:
+        """
+        Whether :meth:`singleton` shares the engine for this configuration. An
+        in-memory SQLite database only lives as long as its connection, so closing it
+        for one caller would empty it for every other; these are never shared.
+
+        >>> from fruition.database.engine import EngineFactory
+        >>> EngineFactory.is_shareable("sqlite")
+        False
+        >>> EngineFactory.is_shareable("sqlite", database="/tmp/fruition.db")
+        True
+        >>> EngineFactory.is_shareable("postgres")
+        True
+        """
+        configuration = {**EngineFactory.DEFAULTS.get(engine_type, {}), **engine_kwargs}
+        return not (
+            str(configuration.get("drivername", "")).startswith("sqlite")
+            and configuration.get("database", None) in (":memory:", "")
+        )
+
     @staticmethod
     def singleton(engine_type: str, **engine_kwargs: Any) -> EngineBase:
         """
         Gets a single SQLAlchemy engine.
+
+        These come from one factory for the whole process, so every caller asking for the
+        same configuration shares the engine and its connection pool. Callers shouldn't
+        dispose of shared engines, as that closes the connections of every other caller;
+        leave them open for the life of the process. Forked children get their own
+        factory. In-memory SQLite engines aren't shared (see :meth:`is_shareable`),
+        each call gets a new engine and database.
         """
-        return next(iter(EngineFactory().get(engine_type, **engine_kwargs)))
+        global _DEFAULT_FACTORY
+        if not EngineFactory.is_shareable(engine_type, **engine_kwargs):
+            return next(iter(EngineFactory().get(engine_type, **engine_kwargs)))
+        with _DEFAULT_FACTORY_LOCK:
+            # Held while getting the engine too, so threads can't create it twice
+            if _DEFAULT_FACTORY is None:
+                _DEFAULT_FACTORY = EngineFactory()
+            return next(iter(_DEFAULT_FACTORY.get(engine_type, **engine_kwargs)))
 
     def dispose(self, engine: Engine) -> None:
         """
@@ -255,26 +552,30 @@ class EngineFactory:
 
         :param engine fruition.database.engine.Engine: The engine to dispose of.
         """
-        self.stores = [store for store in self.stores if store.engine is not engine]
+        key = self.engine_keys.pop(id(engine), None)
+        if key is not None:
+            self.store_index.pop(key, None)
         engine.dispose()
 
     def __getitem__(self, key: str) -> Engine:
-        return cast(Engine, getattr(self, key))
+        return self.get(key)
 
     def __delitem__(self, key: str) -> None:
         return delattr(self, key)
 
     def __getattr__(self, key: str) -> Engine:
+        if key.startswith("_"):
+            raise AttributeError(key)
         return self.get(key)
 
     def __enter__(self) -> EngineFactory:
         return self
 
     def __exit__(self, *args: Any) -> None:
-        _stores = self.stores
-        self.stores = []
-        for store in _stores:
-            store.dispose()
+        _stores = self.store_index.values()
+        self.store_index = {}
+        self.engine_keys = {}
+        dispose_all(store.dispose for store in _stores)
 
     class EngineStore:
         """
@@ -302,3 +603,22 @@ class EngineFactory:
             Initializes the engine.
             """
             self.engine = Engine(self.engine_type, **self.configuration)
+
+
+_DEFAULT_FACTORY: Optional[EngineFactory] = None
+_DEFAULT_FACTORY_LOCK = threading.Lock()
+
+
+def _reset_default_factory() -> None:
+    """
+    Forked processes must not share pooled connections with their parent, so they
+    start with a new default factory.
+    """
+    global _DEFAULT_FACTORY, _DEFAULT_FACTORY_LOCK
+    _DEFAULT_FACTORY = None
+    # The parent's lock may have been held by another thread when forking
+    _DEFAULT_FACTORY_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_default_factory)
@@ -3,8 +3,10 @@ from __future__ import (
 )  # allows accessing declared classes in this file in type hints
 
 import sqlalchemy
+import functools
 
 from traceback import format_exc
+from types import MappingProxyType
 
 from fruition.api.exceptions import PermissionError, BadRequestError
 from fruition.api.configuration import APIConfiguration
@@ -16,7 +18,21 @@ from fruition.util.encryption import AESCipher
 
 from fruition.database.engine import EngineFactory
 
-from typing import Optional, Type, Iterator, Any, Callable, Union, List, Dict, cast
+from typing import (
+    Optional,
+    Type,
+    Iterator,
+    Iterable,
+    Any,
+    Callable,
+    Union,
+    List,
+    Dict,
+    Tuple,
+    Mapping,
+    FrozenSet,
+    cast,
+)
 
 from sqlalchemy import Column, Integer, String, Sequence, ForeignKey
 
@@ -24,7 +40,7 @@ from sqlalchemy.exc import InvalidRequestError
 
 from sqlalchemy.orm import sessionmaker, scoped_session, relationship, Query
 from sqlalchemy.orm.session import Session
-from sqlalchemy.orm.attributes import InstrumentedAttribute, ScalarAttributeImpl
+from sqlalchemy.orm.attributes import InstrumentedAttribute
 
 from sqlalchemy.engine import Dialect, Engine
 from sqlalchemy.ext.declarative import declarative_base
@@ -174,6 +190,54 @@ class ORMSession:
             self.close()
 
 
+def get_column_keys(declared: Type) -> Tuple[str, ...]:
+    """
+    Gets the keys of the columns mapped on a declared class, in column order. These
+    are cached on the class.
+
+    This isn't done in ORM.extend(), as inspecting columns configures every mapper,
+    and relationships may name classes that aren't declared yet.
+    """
+    column_keys = declared.__dict__.get("__column_keys__", None)
+    if column_keys is None:
+        column_keys = tuple(
+            column.key for column in sqlalchemy.inspect(declared).column_attrs
+        )
+        setattr(declared, "__column_keys__", column_keys)
+    return cast(Tuple[str, ...], column_keys)
+
+
+def get_visible_column_keys(
+    declared: Type, show: FrozenSet[str] = frozenset()
+) -> Tuple[str, ...]:
+    """
+    Gets the keys of the columns that format() passes through, after removing hidden
+    columns and any default hidden columns not in ``show``.
+    """
+    # The sets are only used from the class that declared them. A subclass can set its
+    # own lists, which must win over a parent's sets.
+    hidden = declared.__dict__.get("__hidden_columns_set__", None)
+    if hidden is None:
+        hidden = frozenset(getattr(declared, "__hidden_columns__", []))
+    default_hidden = declared.__dict__.get("__default_hidden_columns_set__", None)
+    if default_hidden is None:
+        default_hidden = frozenset(getattr(declared, "__default_hidden_columns__", []))
+    hidden = hidden | (default_hidden - show)
+    return tuple(key for key in get_column_keys(declared) if key not in hidden)
+
+
+def get_column_values(instance: Any, column_keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Reads column values from an instance. Loaded values are read from the instance
+    state, so this only goes to the database for columns that are expired or deferred.
+    """
+    loaded = sqlalchemy.inspect(instance).dict
+    return {
+        key: loaded[key] if key in loaded else getattr(instance, key)
+        for key in column_keys
+    }
+
+
 class ORMSolidifiedObject:
     """
     A small way to "solidify" an object.
@@ -269,6 +333,7 @@ class ORMObjectBase:
             columns = cast(List[str], [columns])
         existing_columns.extend(columns)
         setattr(cls, "__hidden_columns__", existing_columns)
+        setattr(cls, "__hidden_columns_set__", frozenset(existing_columns))
 
         existing_relationships: List[str] = []
         existing_relationships.extend(getattr(cls, "__hidden_relationships__", []))
@@ -276,6 +341,7 @@ class ORMObjectBase:
             relationships = cast(List[str], [relationships])
         existing_relationships.extend(relationships)
         setattr(cls, "__hidden_relationships__", existing_relationships)
+        cls._clear_visible_column_keys()
 
     @classmethod
     def DefaultHide(cls, *columns: str) -> None:
@@ -287,6 +353,21 @@ class ORMObjectBase:
         existing_columns.extend(getattr(cls, "__default_hidden_columns__", []))
         existing_columns.extend(columns)
         setattr(cls, "__default_hidden_columns__", existing_columns)
+        setattr(cls, "__default_hidden_columns_set__", frozenset(existing_columns))
+        cls._clear_visible_column_keys()
+
+    @classmethod
+    def _clear_visible_column_keys(cls) -> None:
+        """
+        Removes the visible columns cached by format() on this class and its
+        subclasses, after the hidden columns change.
+        """
+        classes: List[type] = [cls]
+        while classes:
+            declared = classes.pop()
+            if "__visible_column_keys__" in declared.__dict__:
+                delattr(declared, "__visible_column_keys__")
+            classes.extend(declared.__subclasses__())
 
     @staticmethod
     def _is_simple_data(value: Any) -> bool:
@@ -310,15 +391,7 @@ class ORMObjectBase:
         """
         Returns the dictionary of columns (attributes) for formatting.
         """
-        attribute_dict: Dict[str, Any] = {}
-        for k in dir(self):
-            v = getattr(self, k, None)
-            v_static = getattr(type(self), k, None)
-            v_impl_type = type(getattr(v_static, "impl", None))
-            if v_impl_type is ScalarAttributeImpl:
-                attribute_dict[k] = v
-
-        return attribute_dict
+        return get_column_values(self, get_column_keys(type(self)))
 
     def see(self, *args: ORMObjectBase) -> None:
         """
@@ -342,15 +415,16 @@ class ORMObjectBase:
         "related" to the product object to get that instrumented list and format it as well.
 
         """
-        attributes = self.get_attributes()
-        for hidden in getattr(self, "__hidden_columns__", []):
-            if hidden in attributes:
-                del attributes[hidden]
-        for default_hidden in getattr(self, "__default_hidden_columns__", []):
-            if default_hidden in attributes and default_hidden not in kwargs.get(
-                "show", []
-            ):
-                del attributes[default_hidden]
+        declared = type(self)
+        show = kwargs.get("show", None)
+        if show:
+            column_keys = get_visible_column_keys(declared, frozenset(show))
+        else:
+            column_keys = declared.__dict__.get("__visible_column_keys__", None)
+            if column_keys is None:
+                column_keys = get_visible_column_keys(declared, frozenset())
+                setattr(declared, "__visible_column_keys__", column_keys)
+        attributes = get_column_values(self, column_keys)
 
         response = {
             "type": type(self).__name__.replace("Declarative", ""),
@@ -429,31 +503,45 @@ class ORMObjectBase:
         return ORMSolidifiedObject(**self.get_attributes())
 
     @classmethod
-    def _declared_functions(cls) -> Dict[str, Callable]:
+    @functools.lru_cache(maxsize=None)
+    def _declared_functions(cls) -> Mapping[str, Callable]:
         """
         Gets the functions that will pass through into the results of the session queries.
+        These don't change, so they are cached per class.
+        """
+        return MappingProxyType(
+            {
+                "format": cls.format,
+                "solidify": cls.solidify,
+                "see": cls.see,
+                "get_attributes": cls.get_attributes,
+            }
+        )
+
+    @classmethod
+    def _declared_columns(cls) -> List[sqlalchemy.Column]:
         """
-        return {
-            "format": cls.format,
-            "solidify": cls.solidify,
-            "see": cls.see,
-            "get_attributes": cls.get_attributes,
-        }
+        Gets the columns declared directly on this class, cached on the class.
+        """
+        columns = cls.__dict__.get("__declared_columns__", None)
+        if columns is None:
+            columns = [
+                value
+                for value in vars(cls).values()
+                if isinstance(value, sqlalchemy.Column)
+            ]
+            setattr(cls, "__declared_columns__", columns)
+        return cast(List[sqlalchemy.Column], columns)
 
     @classmethod
     def _declared_dict(cls, orm: ORM) -> Dict[str, Any]:
         """
         Gets class variables necessary to declare an object inherited a declarative base.
         """
-        _declared = cls._declared_functions()
-        _declared["__orm__"] = orm  # type: ignore
-        _vars = vars(cls)
-        for mapped in _vars:
-            if isinstance(_vars[mapped], sqlalchemy.Column):
-                setattr(_vars[mapped], "__orm__", orm)
-                setattr(_vars[mapped].type, "__orm__", orm)
-            _declared[mapped] = _vars[mapped]
-        return _declared
+        for column in cls._declared_columns():
+            setattr(column, "__orm__", orm)
+            setattr(column.type, "__orm__", orm)
+        return {**cls._declared_functions(), "__orm__": orm, **vars(cls)}
 
     @classmethod
     def _declared_classes(cls) -> Iterator[Type[ORMObjectBase]]:
@@ -758,28 +846,53 @@ class ORM:
 class ORMBuilder(ORM):
     """
     A simple helper for building an ORM programmatically.
+
+    By default, the engine is shared with every other builder in the process using the
+    same configuration (see :meth:`fruition.database.engine.EngineFactory.singleton`.)
+    Pass ``shared = False`` to build an engine for this ORM alone.
     """
 
     def __init__(
-        self, engine_type: str, engine_kwargs: Dict[str, Any] = {}, **kwargs: Any
+        self,
+        engine_type: str,
+        engine_kwargs: Dict[str, Any] = {},
+        shared: bool = True,
+        **kwargs: Any,
     ):
         self.engine_type = engine_type
         self.engine_kwargs = engine_kwargs
         self.init_kwargs = kwargs
-        super(ORMBuilder, self).__init__(
-            EngineFactory.singleton(self.engine_type, **self.engine_kwargs),
-            **self.init_kwargs,
+        self.shared = shared and EngineFactory.is_shareable(
+            self.engine_type, **self.engine_kwargs
         )
+        if self.shared:
+            engine = EngineFactory.singleton(self.engine_type, **self.engine_kwargs)
+        else:
+            engine = next(
+                iter(EngineFactory().get(self.engine_type, **self.engine_kwargs))
+            )
+        super(ORMBuilder, self).__init__(engine, **self.init_kwargs)
+
+    def dispose(self) -> None:
+        """
+        Disposes (closes) all connections, when the engine belongs to this ORM. Shared
+        engines are left open for the other ORMs using them.
+        """
+        if not self.shared:
+            super(ORMBuilder, self).dispose()
 
     def duplicate(self) -> ORMBuilder:
         """
-        Creates another instance of the ORM. Importantly, this creates a new engine connection,
-        so this should be called after a fork() to get a new connection in the other thread.
+        Creates another instance of the ORM. Importantly, this creates a new engine that
+        isn't shared, so this can be called after a fork() to get new connections in the
+        child process.
         """
         logger.debug(
             f"Duplicating ORM of type {self.engine_type}, engine parameters {self.engine_kwargs}, initialization parameters {self.init_kwargs}"
         )
-        return ORMBuilder(self.engine_type, self.engine_kwargs, **self.init_kwargs)
+        return ORMBuilder(
+            self.engine_type, self.engine_kwargs, shared=False, **self.init_kwargs
+        )
 
     @staticmethod
     def from_configuration(
@@ -44,6 +44,8 @@ extras_require = {
     "aws": ["boto3>=1.26,<2.0"],
     "ftp": ["pyftpdlib>=1.5,<2.0"],
     "xml": ["lxml>=4.9,<5.0"],
+    "json": ["orjson>=3.8,<4.0"],
+    "numba": ["numba>=0.57,<1.0"],
     "build": [
         "sphinx>=6.2,<6.3",
         "sphinx-rtd-theme>=1.2,<1.3",
@@ -25,6 +25,83 @@ class TestServer(WebServiceAPIServerBase):
             fh.write(self.configuration.get("contents"))
         return path
 
+    @handlers.methods("GET")
+    @handlers.path("^/cached$")
+    @handlers.cache(60)
+    def cached(self, request: Request, response: Response) -> str:
+        self.calls = getattr(self, "calls", 0) + 1
+        response.headers["Date"] = "Thu, 01 Jan 1970 00:00:00 GMT"
+        return str(self.calls)
+
+    @handlers.methods("GET")
+    @handlers.path("^/expiring$")
+    @handlers.cache(1)
+    def expiring(self, request: Request, response: Response) -> str:
+        self.calls = getattr(self, "calls", 0) + 1
+        return str(self.calls)
+
+    @handlers.methods("GET")
+    @handlers.path("^/cookie$")
+    @handlers.cache(60)
+    def cookie(self, request: Request, response: Response) -> str:
+        self.calls = getattr(self, "calls", 0) + 1
+        response.set_cookie("session", str(self.calls))
+        return str(self.calls)
+
+
+def test_response_cache(server: TestServer) -> None:
+    """
+    Requests are made directly against the server in this process, so the handlers'
+    call counter shows whether a response came from the cache.
+    """
+
+    def get(path: str, **headers: str) -> Response:
+        return server.handle_request(Request.blank(path, headers=headers), Response())
+
+    first = get("/cached?key=a").text
+    hit = get("/cached?key=a")
+    Assertion(Assertion.EQ)(hit.text, first)
+    Assertion(Assertion.EQ)(hit.headers.get("Date", None), None)
+    Assertion(Assertion.EQ)(hit.headers["Cache-Control"], "max-age=60")
+
+    # Cached headers are merged into the response, not replacing it
+    existing = Response()
+    existing.headers["X-Existing"] = "kept"
+    server.handle_request(Request.blank("/cached?key=a"), existing)
+    Assertion(Assertion.EQ)(existing.text, first)
+    Assertion(Assertion.EQ)(existing.headers["X-Existing"], "kept")
+
+    # Headers that change the response change the key
+    for headers in [
+        {"Authorization": "Bearer token"},
+        {"Cookie": "session=1"},
+        {"Accept-Encoding": "gzip"},
+    ]:
+        server.response_cache.clear()
+        base = get("/cached?key=a").text
+        varied = get("/cached?key=a", **headers)
+        Assertion(Assertion.NEQ)(varied.body, base.encode("utf-8"))
+        Assertion(Assertion.EQ)(get("/cached?key=a", **headers).body, varied.body)
+
+    # The least recently used response is evicted, the cache holds two
+    server.response_cache.clear()
+    a = get("/cached?key=a").text
+    b = get("/cached?key=b").text
+    Assertion(Assertion.EQ)(get("/cached?key=a").text, a)
+    get("/cached?key=c")
+    Assertion(Assertion.EQ)(len(server.response_cache), 2)
+    Assertion(Assertion.EQ)(get("/cached?key=a").text, a)
+    Assertion(Assertion.NEQ)(get("/cached?key=b").text, b)
+
+    expiring = get("/expiring").text
+    Assertion(Assertion.EQ)(get("/expiring").text, expiring)
+    Pause.milliseconds(1100)
+    Assertion(Assertion.NEQ)(get("/expiring").text, expiring)
+
+    # Responses setting cookies belong to one client
+    cookie = get("/cookie").text
+    Assertion(Assertion.NEQ)(get("/cookie").text, cookie)
+
 
 def main() -> None:
     context = TempfileContext()
@@ -34,8 +111,14 @@ def main() -> None:
             server = TestServer()
             server.configure(
                 contents=random_contents,
-                server={"driver": "werkzeug", "host": "0.0.0.0", "port": 8192},
+                server={
+                    "driver": "werkzeug",
+                    "host": "0.0.0.0",
+                    "port": 8192,
+                    "cache": {"size": 2},
+                },
             )
+            test_response_cache(server)
 
             try:
                 for client_class in [
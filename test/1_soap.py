@@ -1,4 +1,8 @@
+import gzip
+import lxml.etree as ET
+
 from typing import TypedDict
+from webob import Request, Response
 
 from fruition.api.client.webservice.wrapper import WebServiceAPIClientWrapper
 from fruition.api.client.webservice.soap import SOAPClient
@@ -34,6 +38,100 @@ def pow(base: int, exponent: int = 2) -> PowResult:
     return {"result": base**exponent, "base": base, "exponent": exponent}
 
 
+@server.register
+@server.sign_request(str)
+@server.sign_response(str)
+def echo(value: str) -> str:
+    return value
+
+
+def call(method: str, *arguments: str, **keyword_arguments: str) -> Response:
+    """
+    Posts a raw envelope to the server in this process.
+    """
+    namespace = "http://127.0.0.1:9091/Calculator.xsd"
+    parts = [
+        f"<x:listIndex{i}>{argument}</x:listIndex{i}>"
+        for i, argument in enumerate(arguments)
+    ] + [f"<x:{key}>{value}</x:{key}>" for key, value in keyword_arguments.items()]
+    body = (
+        '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"'
+        f' xmlns:x="{namespace}"><soapenv:Body><x:{method}Request>{"".join(parts)}'
+        f"</x:{method}Request></soapenv:Body></soapenv:Envelope>"
+    )
+    request = Request.blank(
+        "/services/Calculator", method="POST", body=body.encode("utf-8")
+    )
+    return request.get_response(server.wsgi())
+
+
+def results(response: Response) -> list:
+    """
+    Gets the text of each part of a method response.
+    """
+    Assertion(Assertion.EQ)(response.status_int, 200)
+    envelope = ET.fromstring(response.body)
+    return [node.text for node in envelope.iter() if not len(node)]
+
+
+def test_method_calls() -> None:
+    Assertion(Assertion.EQ)(results(call("add", "1", "2")), ["3"])
+    # Strings aren't deserialized, so they come back as they went
+    Assertion(Assertion.EQ)(results(call("echo", "007")), ["007"])
+    Assertion(Assertion.EQ)(
+        results(call("pow", base="2", exponent="3")), ["8", "2", "3"]
+    )
+    # Arguments may arrive out of order
+    Assertion(Assertion.EQ)(
+        results(call("add", **{"listIndex1": "2", "listIndex0": "1"})), ["3"]
+    )
+    # Too many, missing or unknown arguments are rejected
+    Assertion(Assertion.EQ)(call("add", "1", "2", "3").status_int, 400)
+    Assertion(Assertion.EQ)(call("add", **{"listIndex1": "2"}).status_int, 400)
+    Assertion(Assertion.EQ)(call("pow", base="2", power="3").status_int, 400)
+    for name in ["listIndex-1", "listIndexfoo", "listIndex"]:
+        Assertion(Assertion.EQ)(call("add", "1", **{name: "2"}).status_int, 400)
+        Assertion(Assertion.EQ)(call("pow", base="2", **{name: "3"}).status_int, 400)
+
+
+def test_documents() -> None:
+    for path in ["/Calculator.wsdl", "/Calculator.xsd"]:
+        response = Request.blank(path).get_response(server.wsgi())
+        Assertion(Assertion.EQ)(response.status_int, 200)
+        etag = response.etag
+        Assertion(Assertion.T)(etag)
+        ET.fromstring(response.body)
+
+        # The same document is served until something changes
+        request = Request.blank(path, headers={"If-None-Match": f'"{etag}"'})
+        cached = request.get_response(server.wsgi())
+        Assertion(Assertion.EQ)(cached.status_int, 304)
+        Assertion(Assertion.EQ)(cached.body, b"")
+
+        request = Request.blank(path, headers={"Accept-Encoding": "gzip"})
+        compressed = request.get_response(server.wsgi())
+        Assertion(Assertion.EQ)(compressed.headers["Content-Encoding"], "gzip")
+        Assertion(Assertion.EQ)(gzip.decompress(compressed.body), response.body)
+
+    # Registering a method changes the document, and its ETag
+    etag = Request.blank("/Calculator.wsdl").get_response(server.wsgi()).etag
+
+    @server.register
+    @server.sign_request(int)
+    @server.sign_response(int)
+    def negate(value: int) -> int:
+        return -value
+
+    request = Request.blank(
+        "/Calculator.wsdl", headers={"If-None-Match": f'"{etag}"'}
+    )
+    response = request.get_response(server.wsgi())
+    Assertion(Assertion.EQ)(response.status_int, 200)
+    Assertion(Assertion.NEQ)(response.etag, etag)
+    Assertion(Assertion.T)(b"negateRequest" in response.body)
+    Assertion(Assertion.EQ)(results(call("negate", "4")), ["-4"])
+
+
 def main() -> None:
     with DebugUnifiedLoggingContext():
         server.configure(
@@ -44,6 +142,8 @@ def main() -> None:
                 "name": "Calculator",
             }
         )
+        test_method_calls()
+        test_documents()
         try:
             for client_class in [SOAPClientWrapper, SOAPClient]:
                 if client_class is SOAPClient:
@@ -1,15 +1,100 @@
+import os
+import shutil
+import tempfile
+import threading
+
 from fruition.database.engine import EngineFactory
 from fruition.database.util import row_to_dict
 from fruition.util.log import DebugUnifiedLoggingContext
-from fruition.util.helpers import Assertion
+from fruition.util.helpers import Assertion, expect_exception
+
+
+def test_singleton() -> None:
+    engines = []
+    tempdir = tempfile.mkdtemp()
+    database = os.path.join(tempdir, "test.db")
+
+    def get_engine() -> None:
+        engines.append(EngineFactory.singleton("sqlite", database=database))
+
+    try:
+        threads = [threading.Thread(target=get_engine) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        Assertion(Assertion.EQ)(len(set(id(engine) for engine in engines)), 1)
+    finally:
+        shutil.rmtree(tempdir)
+
+    # In-memory databases close with their engine, so each gets its own
+    first, second = EngineFactory.singleton("sqlite"), EngineFactory.singleton("sqlite")
+    Assertion(Assertion.T)(first is not second)
+    first.execute("CREATE TABLE t (id INTEGER)")
+    first.dispose()
+    expect_exception(Exception)(lambda: first.execute("SELECT * FROM t"))
+    second.execute("CREATE TABLE t (id INTEGER)")
+
+
+def test_engine(factory: EngineFactory) -> None:
+    tempdir = tempfile.mkdtemp()
+    try:
+        engine = factory.sqlite
+        path = os.path.join(tempdir, "test.db")
+        database = engine[path]
+        Assertion(Assertion.T)(engine[path] is database)
+        Assertion(Assertion.T)(getattr(engine, path) is database)
+        # Private names are never treated as databases
+        expect_exception(AttributeError)(lambda: engine._repr_html_)
+        Assertion(Assertion.EQ)(list(engine), [engine.default(), database])
+
+        # Deleting disposes of the engine, replacing its pool
+        pool = database.pool
+        del engine[path]
+        Assertion(Assertion.NEQ)(database.pool, pool)
+        Assertion(Assertion.T)(path not in engine.engines)
+        # Deleting an engine that isn't open is fine
+        del engine[path]
+        Assertion(Assertion.T)(engine[path] is not database)
+
+        engine.dispose()
+        Assertion(Assertion.EQ)(engine.engines, {})
+        # The URL is kept, and the engine can be opened again
+        Assertion(Assertion.T)(path in engine.urls)
+        Assertion(Assertion.EQ)(engine[path].execute("SELECT 1").scalar(), 1)
+
+        # Disposing through the factory forgets the engine
+        factory.dispose(engine)
+        Assertion(Assertion.T)(factory.sqlite is not engine)
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def test_threads(factory: EngineFactory) -> None:
+    # In-memory databases are used by every thread, however the pool was chosen
+    for configuration in [{}, {"pool_class": "static"}]:
+        engine = factory.get("sqlite", **configuration)[":memory:"]
+        engine.execute("CREATE TABLE t (id INTEGER)")
+        results = []
+
+        def count() -> None:
+            results.append(engine.execute("SELECT COUNT(*) FROM t").scalar())
+
+        thread = threading.Thread(target=count)
+        thread.start()
+        thread.join()
+        Assertion(Assertion.EQ)(results, [0])
 
 
 def main() -> None:
     with DebugUnifiedLoggingContext():
+        test_singleton()
         with EngineFactory() as factory:
             sqlite = factory.sqlite[":memory:"]
             version = row_to_dict(sqlite.execute("SELECT sqlite_version()"))
             Assertion(Assertion.EQ)(list(version.keys()), ["sqlite_version()"])
+            test_engine(factory)
+            test_threads(factory)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
-from typing import Dict
+import json
+
+from typing import Any, Dict
+from webob import Request, Response
 
 from fruition.api.server.webservice.rpc.jsonrpc import JSONRPCServer
 from fruition.api.client.webservice.rpc.jsonrpc import JSONRPCClient
@@ -35,11 +38,81 @@ def pow(base: int, exponent: int = 2) -> Dict[str, int]:
     return {"result": base**exponent}
 
 
+def call(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Posts a raw request to the server in this process.
+    """
+    request = Request.blank(
+        "/RPC2", method="POST", body=json.dumps(body).encode("utf-8")
+    )
+    return json.loads(server.handle_request(request, Response()).body)
+
+
+def test_bad_requests() -> None:
+    Assertion(Assertion.EQ)(
+        call({"jsonrpc": "1.0", "method": "add", "params": [1, 2], "id": 1}),
+        {
+            "jsonrpc": "2.0",
+            "code": -32600,
+            "message": "Unsupported JSONRPC version '1.0', must be '2.0'.",
+        },
+    )
+    Assertion(Assertion.EQ)(
+        call({"method": "add", "params": [1, 2], "id": 1})["message"],
+        "Missing JSONRPC specifier. Must be present and set to '2.0'.",
+    )
+    Assertion(Assertion.EQ)(
+        call({"jsonrpc": "2.0", "params": [1, 2], "id": 1})["message"],
+        "Missing method name in request.",
+    )
+
+
+def test_responses() -> None:
+    Assertion(Assertion.EQ)(
+        call({"jsonrpc": "2.0", "method": "pow", "params": {"base": 3}, "id": 7}),
+        {"jsonrpc": "2.0", "result": {"result": 9}, "id": 7},
+    )
+    # Types in signatures are serialized by name
+    Assertion(Assertion.EQ)(
+        call(
+            {
+                "jsonrpc": "2.0",
+                "method": "system.methodSignature",
+                "params": ["add"],
+                "id": 9,
+            }
+        )["result"],
+        [["int", "int", "int"]],
+    )
+
+    # Responses are encoded once, and set on the body as they are
+    request = Request.blank(
+        "/RPC2",
+        method="POST",
+        body=b'{"jsonrpc": "2.0", "method": "add", "params": [1, 2], "id": "a"}',
+    )
+    formatted = server.format_response("\u00e9", request, Response())
+    Assertion(Assertion.T)(isinstance(formatted, bytes))
+    Assertion(Assertion.EQ)(
+        json.loads(formatted), {"jsonrpc": "2.0", "result": "\u00e9", "id": "a"}
+    )
+
+    # Notifications have no ID, and aren't answered
+    request = Request.blank(
+        "/RPC2",
+        method="POST",
+        body=b'{"jsonrpc": "2.0", "method": "add", "params": [1, 2]}',
+    )
+    Assertion(Assertion.EQ)(server.handle_request(request, Response()).body, b"")
+
+
 def main() -> None:
     with DebugUnifiedLoggingContext():
         server.configure(
             **{"server": {"driver": "werkzeug", "host": "0.0.0.0", "port": 8192}}
         )
+        test_bad_requests()
+        test_responses()
         server.start()
 
         try:
@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import sqlalchemy
 
 from fruition.database.orm import (
@@ -66,6 +69,58 @@ class PageKeywords(ORMTestBase):
     keyword = Keyword.Relationship(backref="PageKeywords")
 
 
+class HideTestBase(ORMObjectBase):
+    pass
+
+
+HideTestBase.Hide(columns=["password"])
+
+
+class SecretHideTestBase(HideTestBase):
+    __hidden_columns__ = ["secret"]
+
+
+def hide_test_columns() -> dict:
+    return {
+        "id": sqlalchemy.Column(sqlalchemy.Integer, primary_key=True),
+        "password": sqlalchemy.Column(sqlalchemy.String),
+        "secret": sqlalchemy.Column(sqlalchemy.String),
+    }
+
+
+def test_hide(orm: ORM) -> None:
+    Account = orm.extend("account", hide_test_columns(), cls=ORMObjectBase)
+    Vault = orm.extend("vault", hide_test_columns(), cls=SecretHideTestBase)
+    with orm.session() as session:
+        account = session.add(Account(id=1, password="password", secret="secret"))
+        vault = session.add(Vault(id=1, password="password", secret="secret"))
+        session.commit()
+
+        Assertion(Assertion.EQ)(
+            account.format()["attributes"],
+            {"id": 1, "password": "password", "secret": "secret"},
+        )
+
+        # Hiding after formatting must not use the previously visible columns
+        Account.Hide(columns=["password"])
+        Assertion(Assertion.EQ)(
+            account.format()["attributes"], {"id": 1, "secret": "secret"}
+        )
+        Account.DefaultHide("secret")
+        Assertion(Assertion.EQ)(account.format()["attributes"], {"id": 1})
+        Assertion(Assertion.EQ)(
+            account.format(show=["secret"])["attributes"],
+            {"id": 1, "secret": "secret"},
+        )
+
+        # The subclass' own hidden columns replace its parent's
+        Assertion(Assertion.EQ)(
+            vault.format()["attributes"], {"id": 1, "password": "password"}
+        )
+        SecretHideTestBase.Hide(columns=["password"])
+        Assertion(Assertion.EQ)(vault.format()["attributes"], {"id": 1})
+
+
 def test_oop(orm: ORM) -> None:
     with orm.session() as session:
         page_1 = session.add(
@@ -203,11 +258,50 @@ def test_oop(orm: ORM) -> None:
         )
 
 
+def test_dispose() -> None:
+    # As when a client and server with in-memory databases run in one process
+    first, second = ORMBuilder("sqlite"), ORMBuilder("sqlite")
+    Assertion(Assertion.T)(first.engine is not second.engine)
+    for orm in [first, second]:
+        orm.extend(
+            "note", {"id": sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)}
+        )
+    with second.session() as session:
+        session.add(second.note(id=1))
+        session.commit()
+    first.dispose()
+    with second.session() as session:
+        Assertion(Assertion.EQ)(session.query(second.note).count(), 1)
+    second.dispose()
+
+    # File databases are shared, so disposing one ORM leaves the engine open
+    tempdir = tempfile.mkdtemp()
+    try:
+        database = os.path.join(tempdir, "test.db")
+        first = ORMBuilder("sqlite", {"database": database})
+        second = ORMBuilder("sqlite", {"database": database})
+        Assertion(Assertion.T)(first.engine is second.engine)
+        pool = second.engine.pool
+        first.dispose()
+        Assertion(Assertion.T)(second.engine.pool is pool)
+
+        # Duplicates get their own engine, which they close
+        duplicate = second.duplicate()
+        Assertion(Assertion.T)(duplicate.engine is not second.engine)
+        pool = duplicate.engine.pool
+        duplicate.dispose()
+        Assertion(Assertion.T)(duplicate.engine.pool is not pool)
+    finally:
+        shutil.rmtree(tempdir)
+
+
 def main() -> None:
     with DebugUnifiedLoggingContext():
         orm = ORMBuilder("sqlite", base=ORMTestBase)
         orm.migrate()
         test_oop(orm)
+        test_hide(orm)
+        test_dispose()
 
 
 if __name__ == "__main__":
@@ -1,19 +1,52 @@
+from __future__ import annotations
+
 import os
 import tempfile
 import shutil
 import socket
+import logging
+
+from typing import Any, List
+from webob import Request
 
 from fruition.util.helpers import expect_exception, ignore_exceptions, Assertion
-from fruition.util.log import DebugUnifiedLoggingContext
+from fruition.util.log import DebugUnifiedLoggingContext, logger
 from fruition.api.exceptions import NotFoundError
 from fruition.api.exceptions import PermissionError
+from fruition.api.configuration import APIConfiguration
 from fruition.api.server.webservice.template import (
     TemplateServer,
     TemplateServerHandlerRegistry,
 )
+from fruition.api.server.webservice.template.loader import TemplateLoader
+from fruition.api.server.webservice.template.extensions import (
+    ExampleFunctionExtension,
+)
 from fruition.api.client.webservice.base import WebServiceAPIClientBase
 
 
+class CapturedLogs(logging.Filter):
+    """
+    Collects the messages logged while in context. This is a filter, as the logging
+    context fixes the handlers.
+    """
+
+    def __init__(self) -> None:
+        super(CapturedLogs, self).__init__()
+        self.messages: List[str] = []
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        self.messages.append(record.getMessage())
+        return True
+
+    def __enter__(self) -> CapturedLogs:
+        logger.addFilter(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        logger.removeFilter(self)
+
+
 class TestTemplateServer(TemplateServer):
     handlers = TemplateServerHandlerRegistry()
 
@@ -40,6 +73,27 @@ class TestTemplateServer(TemplateServer):
     def error_403(self, request, response):
         raise PermissionError()
 
+    @handlers.template("context.html.j2", stream=True)
+    @handlers.path("/stream.html")
+    @handlers.methods("GET")
+    def stream(self, request, response):
+        return {"context": "streamed", "url": self.resolve("Base")}
+
+    @handlers.template("no-template.html.j2", stream=True)
+    @handlers.path("/stream_none")
+    @handlers.methods("GET")
+    def stream_missing(self, request, response):
+        return {}
+
+    @handlers.template("fail.html.j2", stream=True)
+    @handlers.path("/stream_error")
+    @handlers.methods("GET")
+    def stream_error(self, request, response):
+        def fail():
+            raise ValueError("Failed partway through rendering.")
+
+        return {"fail": fail}
+
     @handlers.errors(404)
     @handlers.methods("GET")
     @handlers.template("context.html.j2")
@@ -47,6 +101,37 @@ class TestTemplateServer(TemplateServer):
         return {"context": "error"}
 
 
+def test_string_templates(tempdir: str) -> None:
+    cache_dir = os.path.join(tempdir, "bytecode")
+    configuration = APIConfiguration(
+        **{"server": {"template": {"bytecode_cache_dir": cache_dir}}}
+    )
+    loader = TemplateLoader(configuration)
+    template = loader.get_template("{{ var }}!", False)
+    Assertion(Assertion.EQ)(template.render(var=1), "1!")
+    Assertion(Assertion.T)(loader.get_template("{{ var }}!", False) is template)
+    Assertion(Assertion.EQ)(len(os.listdir(cache_dir)), 1)
+
+    # Another loader (as in another process) uses the compiled code
+    loader = TemplateLoader(configuration)
+
+    def compile(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("Template was compiled again.")
+
+    setattr(loader.environment, "compile", compile)
+    template = loader.get_template("{{ var }}!", False)
+    Assertion(Assertion.EQ)(template.render(var=2), "2!")
+    delattr(loader.environment, "compile")
+
+    # Adding an extension drops templates compiled without it
+    template = loader.get_template("{{ var }}!", False)
+    loader.extend(ExampleFunctionExtension)
+    Assertion(Assertion.T)(loader.get_template("{{ var }}!", False) is not template)
+    Assertion(Assertion.EQ)(
+        loader.get_template("{{ square(var) }}", False).render(var=3), "9"
+    )
+
+
 def main() -> None:
     with DebugUnifiedLoggingContext():
         server = TestTemplateServer()
@@ -54,6 +139,11 @@ def main() -> None:
         try:
             with open(os.path.join(tempdir, "context.html.j2"), "w") as template_file:
                 template_file.write("{{ context }}{{ url }}")
+            with open(os.path.join(tempdir, "fail.html.j2"), "w") as template_file:
+                template_file.write(
+                    "{% for i in range(1000) %}{{ i }}{% endfor %}{{ fail() }}"
+                )
+            test_string_templates(tempdir)
 
             server.configure(
                 server={
@@ -80,6 +170,21 @@ def main() -> None:
             expect_exception(PermissionError)(lambda: client.get("/error_403"))
             expect_exception(Exception)(lambda: client.get("/none"))
 
+            Assertion(Assertion.EQ)(
+                client.get("/stream.html").text, "streamed/base.html"
+            )
+            expect_exception(Exception)(lambda: client.get("/stream_none"))
+
+            # The response has started when rendering fails, so the error is logged,
+            # then raised to the WSGI server. Run in this process to see the log.
+            with CapturedLogs() as logs:
+                response = Request.blank("/stream_error").get_response(server.wsgi())
+                Assertion(Assertion.EQ)(response.status_int, 200)
+                expect_exception(ValueError)(lambda: b"".join(response.app_iter))
+            Assertion(Assertion.T)(
+                any("ValueError" in message for message in logs.messages)
+            )
+
         finally:
             ignore_exceptions(server.stop)
             shutil.rmtree(tempdir)
@@ -1,5 +1,9 @@
 import time
+import lxml.etree as ET
+
 from typing import TypedDict
+from lxml.builder import E
+from webob import Request, Response
 
 from fruition.api.server.webservice.rpc.xmlrpc import XMLRPCServer
 from fruition.api.client.webservice.rpc.xmlrpc import XMLRPCClient
@@ -47,11 +51,47 @@ def root(value: int, root: int = 2) -> RootResult:
     return {"value": value, "root": root, "result": value ** (1 / float(root))}
 
 
+@server.register
+@server.sign_request(str)
+@server.sign_response(str)
+def echo(value: str) -> str:
+    """
+    Returns the value it was given.
+    """
+    return value
+
+
+@server.register
+@server.sign_request()
+@server.sign_response(str)
+def control() -> str:
+    """
+    Returns a string that can't be written in XML.
+    """
+    return "a\x01b"
+
+
+def test_invalid_xml_characters() -> None:
+    """
+    Calls the server in this process, so the raw response body can be checked.
+    """
+    request = Request.blank(
+        "/RPC2",
+        method="POST",
+        body=ET.tostring(E.methodCall(E.methodName("control"), E.params())),
+    )
+    response = server.handle_request(request, Response())
+    # Must still be well-formed XML, reporting a fault
+    fault = ET.fromstring(response.body).find("fault")
+    Assertion(Assertion.NEQ)(fault, None)
+
+
 def main() -> None:
     with DebugUnifiedLoggingContext():
         server.configure(
             **{"server": {"driver": "werkzeug", "host": "0.0.0.0", "port": 8192}}
         )
+        test_invalid_xml_characters()
         server.start()
         time.sleep(1)
 
@@ -67,6 +107,8 @@ def main() -> None:
                     "add",
                     "pow",
                     "root",
+                    "echo",
+                    "control",
                 ],
             )
             Assertion(Assertion.EQ)(
@@ -78,6 +120,8 @@ def main() -> None:
             Assertion(Assertion.EQ)(
                 client.root(value=4), {"value": 4, "root": 2, "result": 2.0}
             )
+            escaped = "a < b & c]]> 'd' \"e\"\r\n\tf"
+            Assertion(Assertion.EQ)(client.echo(escaped), escaped)
         finally:
             server.stop()
 
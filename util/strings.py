@@ -3,11 +3,12 @@ import sys
 import base64
 import string
 import hashlib
+import functools
 
 import email.parser
 
 from re import compile, sub, split
-from typing import Any, TypedDict, Optional, Union, Tuple, Dict, List, cast
+from typing import Any, TypedDict, Optional, Union, Tuple, Dict, List, Callable, cast
 from random import choice, shuffle
 from uuid import uuid4, UUID
 from json import dumps, loads, JSONDecodeError
@@ -20,6 +21,11 @@ from PIL.PngImagePlugin import PngInfo
 
 from fruition.util.log import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 EMPTY_CASE = compile(r"^$")
 LOWER_CASE = compile(r"^[a-z0-9]+$")
 UPPER_CASE = compile(r"^[A-Z0-9]+$")
@@ -185,6 +191,31 @@ class Serializer:
         bool: lambda p, **k: "true" if p else "false",
     }
 
+    # Strings up to this length have their matching parser memoized.
+    PARSER_CACHE_MAX_LENGTH = 512
+
+    @classmethod
+    def find_parser(cls, parameter: str) -> Optional[Callable[[str], Any]]:
+        """
+        Finds the parser for the first pattern the string matches, if any.
+
+        :param parameter str: The (stripped) string to parse.
+        :returns Optional[Callable]: The parser, or None when nothing matches.
+        """
+        for pattern in cls.PARSE_FORMATS:
+            if pattern.match(parameter):
+                return cls.PARSE_FORMATS[pattern]  # type: ignore
+        return None
+
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def find_cached_parser(cls, parameter: str) -> Optional[Callable[[str], Any]]:
+        """
+        The same as :meth:`find_parser`, but memoized. Only the parser is cached, not
+        the parsed value, so callers never share mutable results.
+        """
+        return cls.find_parser(parameter)
+
     @classmethod
     def deserialize(cls, parameter: Any, permissive: bool = False) -> Any:
         try:
@@ -194,9 +225,12 @@ class Serializer:
                 return dict([(p, cls.deserialize(parameter[p])) for p in parameter])
             elif isinstance(parameter, str):
                 test_parameter = parameter.strip().replace("\n", "")
-                for pattern in cls.PARSE_FORMATS:
-                    if bool(pattern.match(test_parameter)):
-                        return cls.PARSE_FORMATS[pattern](test_parameter)  # type: ignore
+                if len(test_parameter) <= cls.PARSER_CACHE_MAX_LENGTH:
+                    parser = cls.find_cached_parser(test_parameter)
+                else:
+                    parser = cls.find_parser(test_parameter)
+                if parser is not None:
+                    return parser(test_parameter)
         except Exception as ex:
             if permissive:
                 logger.warning(
@@ -334,7 +368,63 @@ def dump_json(obj: Union[list, dict], **kwargs: Any) -> str:
             return dict([(_key, _fix_nan(_obj[_key])) for _key in _obj])
         return _obj
 
-    return dumps(_fix_nan(obj), allow_nan=False, default=Serializer.serialize, **kwargs)
+    kwargs.setdefault("default", Serializer.serialize)
+    return dumps(_fix_nan(obj), allow_nan=False, **kwargs)
+
+
+def dump_json_bytes(
+    obj: Any, default: Callable[[Any], Any] = Serializer.serialize
+) -> bytes:
+    """
+    Dumps JSON to compact UTF-8 encoded bytes.
+
+    Uses orjson when it is installed, falling back to the standard library otherwise.
+    Either way, non-native values are passed through ``default``, which is
+    :meth:`Serializer.serialize` unless otherwise specified.
+
+    >>> from fruition.util.strings import dump_json_bytes
+    >>> from datetime import date
+    >>> dump_json_bytes({"date": date(2020, 1, 1), "nan": float("nan"), "list": [1, None]})
+    b'{"date":"2020-01-01","nan":null,"list":[1,null]}'
+    >>> dump_json_bytes({"big": 2 ** 64, 1: "é"}).decode("utf-8")
+    '{"big":18446744073709551616,"1":"é"}'
+    >>> import fruition.util.strings
+    >>> installed, fruition.util.strings.orjson = fruition.util.strings.orjson, None
+    >>> try:
+    ...     dump_json_bytes({"date": date(2020, 1, 1), "nan": float("nan"), 1: "é"}).decode("utf-8")
+    ... finally:
+    ...     fruition.util.strings.orjson = installed
+    '{"date":"2020-01-01","nan":null,"1":"é"}'
+    """
+    if orjson is not None:
+        try:
+            return cast(
+                bytes,
+                orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS),
+            )
+        except TypeError:
+            # orjson is stricter than the standard library (e.g. integers wider
+            # than 64 bits,) so let the standard library have a crack at it.
+            pass
+    return dump_json(
+        obj, default=default, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def load_json(to_load: Union[str, bytes]) -> Any:
+    """
+    Loads JSON from a string or bytes.
+
+    Uses orjson when it is installed, falling back to the standard library otherwise.
+    Both raise a :class:`json.JSONDecodeError` on malformed JSON.
+
+    >>> from fruition.util.strings import load_json
+    >>> load_json(b'{"a": [1, 2.5, null]}')
+    {'a': [1, 2.5, None]}
+    """
+    if orjson is not None:
+        return orjson.loads(to_load)
+    return loads(to_load)
 
 
 def random_string(